@@ -7,5 +7,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'booking_system.settings')
+# Tells the settings this process serves requests through ASGI
+os.environ['ASGI_SERVER'] = 'True'
 
 application = get_asgi_application()
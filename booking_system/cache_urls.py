@@ -0,0 +1,57 @@
+"""
+Cache configuration from a URL, in the same spirit as dj_database_url.
+
+Supported schemes:
+    locmem://name           per-process memory (default, development only)
+    file:///path/to/dir     files on disk, shared by workers on one host
+    db://table_name         database table (run `manage.py createcachetable`)
+    redis://host:port/db    Redis or any Redis-protocol server (needs `redis`)
+    rediss://...            Redis over TLS
+    dummy://                no caching
+"""
+from urllib.parse import urlparse
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+# Backends culled by Django itself. Redis evicts by its own maxmemory
+# policy and passes OPTIONS on to its connection pool, so MAX_ENTRIES
+# must not reach it.
+BOUNDED_SCHEMES = ('locmem', 'file', 'db')
+
+
+def parse_cache_url(url, alias, max_entries=None, **extra):
+    """
+    Build the Django cache settings for one alias from a cache URL.
+    Aliases sharing a URL are kept apart by location (memory and files)
+    or by key prefix (database and Redis). max_entries bounds the backends
+    Django culls itself and is left out for the others.
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unsupported cache URL scheme: {scheme!r}")
+
+    config = {'BACKEND': BACKENDS[scheme]}
+    if scheme == 'locmem':
+        config['LOCATION'] = f"{parsed.netloc or 'cache'}-{alias}"
+    elif scheme == 'file':
+        config['LOCATION'] = f"{parsed.path.rstrip('/')}/{alias}"
+    elif scheme == 'db':
+        config['LOCATION'] = parsed.netloc or parsed.path.lstrip('/')
+        config['KEY_PREFIX'] = alias
+    elif scheme in ('redis', 'rediss'):
+        config['LOCATION'] = url
+        config['KEY_PREFIX'] = alias
+
+    if max_entries is not None and scheme in BOUNDED_SCHEMES:
+        config['OPTIONS'] = {'MAX_ENTRIES': max_entries}
+
+    config.update(extra)
+    return config
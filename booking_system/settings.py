@@ -7,6 +7,7 @@ Generated by 'django-admin startproject' using Django 4.2.23.
 from pathlib import Path
 import os
 import dj_database_url
+from .cache_urls import parse_cache_url
 if os.path.isfile('env.py'):
     import env
 
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -75,9 +77,33 @@ TEMPLATES = [
 WSGI_APPLICATION = 'booking_system.wsgi.application'
 
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them after
+# every request) and checked before reuse, so each request no longer pays
+# for a new connection and TLS handshake.
 DATABASES = {
-    'default': dj_database_url.parse(os.environ.get("DATABASE_URL"))
+    'default': dj_database_url.parse(
+        os.environ.get("DATABASE_URL"),
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+    )
 }
+DATABASES['default']['CONN_HEALTH_CHECKS'] = (
+    os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+)
+
+# Persistent connections aren't safe under ASGI, where connections aren't
+# returned between requests, so processes started through
+# booking_system/asgi.py open one per request instead. Use a connection
+# pooler such as PgBouncer there (DB_TRANSACTION_POOLING). WSGI workers
+# and management commands keep DB_CONN_MAX_AGE, with or without
+# ASYNC_VIEWS.
+if os.environ.get('ASGI_SERVER') == 'True':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Behind a transaction-pooling PgBouncer (e.g. Heroku connection pooling),
+# server-side cursors do not survive between transactions
+DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = (
+    os.environ.get('DB_TRANSACTION_POOLING') == 'True'
+)
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -128,10 +154,61 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB limit for uploads
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB limit for file uploads
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 1000  # Limit number of form fields
 
-# Rate limiting cache (required for django-ratelimit)
+# Caches - one URL for every alias, e.g. file:///tmp/dog-cache or
+# redis://localhost:6379/0 (see booking_system/cache_urls.py). The default
+# per-process memory cache is not shared between gunicorn workers.
+CACHE_URL = os.environ.get('CACHE_URL', 'locmem://booking')
+
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'ratelimit-cache',
-    }
+    # Pending counters
+    'default': parse_cache_url(CACHE_URL, 'default'),
+    # Rate limiting (required for django-ratelimit)
+    'ratelimit': parse_cache_url(CACHE_URL, 'ratelimit'),
+    # Computed appointment slots, least recently used entries evicted first
+    # (bounded by MAX_ENTRIES, or by Redis' own eviction policy)
+    'slots': parse_cache_url(
+        CACHE_URL, 'slots', max_entries=5000, TIMEOUT=3600
+    ),
+    # {% cache %} template fragments
+    'template_fragments': parse_cache_url(CACHE_URL, 'template_fragments'),
+}
+
+RATELIMIT_USE_CACHE = 'ratelimit'
+
+# Serve the read-only AJAX endpoints (slots, prices, calendar events and
+# available employees) with async views. Only worthwhile under an ASGI
+# server, e.g. gunicorn -k uvicorn.workers.UvicornWorker.
+ASYNC_AJAX_VIEWS = os.environ.get('ASYNC_VIEWS') == 'True'
+
+# Request instrumentation: one JSON log line per request with duration,
+# database time and query count. Disabled unless REQUEST_METRICS=True.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_context': {
+            '()': 'core.instrumentation.RequestContextFilter',
+        },
+    },
+    'formatters': {
+        'json': {
+            '()': 'core.instrumentation.JsonFormatter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'filters': ['request_context'],
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': os.environ.get('CORE_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
 }
@@ -5,3 +5,7 @@ class CoreConfig(AppConfig):
     """Configuration for the core application"""
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        """Connect signal handlers"""
+        from . import signals  # noqa: F401
@@ -0,0 +1,267 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from collections import defaultdict
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from .counters import invalidate_pending_count
+from .models import Appointment, UserProfile, EmployeeCalendar
+from .utils import appointments_overlap, get_overlapping_appointments
+
+# PostgreSQL exclusion constraint rejecting overlapping approved
+# appointments for the same employee (migration 0021)
+OVERLAP_CONSTRAINT = 'appointment_employee_no_overlap'
+
+DECISIONS = ('approve', 'reject', 'reassign')
+
+
+class EmployeeUnavailable(Exception):
+    """The employee already has an approved appointment at that time"""
+
+
+def overlap_enforced_by_database(appointment):
+    """Whether the exclusion constraint covers this appointment"""
+    return connection.vendor == 'postgresql' and appointment.status == 'approved'
+
+
+def assign_employee(appointment, employee):
+    """
+    Assign an appointment to an employee and put it in their calendar,
+    replacing any previous calendar entry. Call it inside a transaction
+    that has locked the appointment and the employee with
+    select_for_update(), so concurrent assignments to the same employee
+    are checked one at a time.
+
+    Raises EmployeeUnavailable if the employee has an overlapping approved
+    appointment. On PostgreSQL the exclusion constraint does that check as
+    part of the update; elsewhere it is a query under the employee lock.
+    """
+    appointment.employee = employee
+
+    if not overlap_enforced_by_database(appointment):
+        if get_overlapping_appointments(appointment).filter(
+            employee=employee
+        ).exists():
+            raise EmployeeUnavailable
+
+    try:
+        # Savepoint, so the caller's transaction survives a violation
+        with transaction.atomic():
+            appointment.save()
+    except IntegrityError as error:
+        if OVERLAP_CONSTRAINT in str(error):
+            raise EmployeeUnavailable from error
+        raise
+
+    EmployeeCalendar.objects.filter(appointment=appointment).delete()
+    EmployeeCalendar.objects.create(
+        user_profile=employee,
+        appointment=appointment,
+        scheduled_time=appointment.appointment_time,
+        available_time=False
+    )
+
+
+def duration_conflicts(service, duration):
+    """
+    Upcoming approved appointments of a service that would overlap another
+    approved appointment of the same employee if the service took this
+    long, i.e. another one starts before the longer appointment would end.
+    """
+    clashes = Appointment.objects.filter(
+        status='approved',
+        employee_id=OuterRef('employee_id'),
+        appointment_time__gte=OuterRef('appointment_time'),
+        appointment_time__lt=OuterRef('appointment_time') + duration,
+    ).exclude(id=OuterRef('id'))
+
+    return Appointment.objects.filter(
+        service=service,
+        status='approved',
+        employee__isnull=False,
+        appointment_time__gte=timezone.now(),
+    ).filter(Exists(clashes)).select_related('employee__user')
+
+
+def decision_result(appointment_id, error=None, **details):
+    """Per-item result of apply_decisions"""
+    if error:
+        return {'appointment_id': appointment_id, 'success': False, 'error': error}
+    return {'appointment_id': appointment_id, 'success': True, **details}
+
+
+def parse_decision(item):
+    """
+    Validate one {appointment_id, decision, employee_id} item.
+    Returns (appointment_id, decision, employee_id) or raises ValueError.
+    """
+    decision = item.get('decision') if isinstance(item, dict) else None
+    if decision not in DECISIONS:
+        raise ValueError(f"Decision must be one of {', '.join(DECISIONS)}")
+    try:
+        appointment_id = int(item['appointment_id'])
+        employee_id = None if decision == 'reject' else int(item['employee_id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('Missing or invalid appointment_id or employee_id')
+    return appointment_id, decision, employee_id
+
+
+def busy_intervals(assignments):
+    """
+    Approved appointments of the employees involved in a batch, within the
+    time the batch covers, in one query.
+    Returns {employee_id: {appointment_id: (start, end)}}.
+    """
+    busy = defaultdict(dict)
+    if not assignments:
+        return busy
+
+    appointments = [appointment for appointment, _ in assignments]
+    employee_ids = {employee.id for _, employee in assignments}
+    employee_ids.update(
+        appointment.employee_id for appointment in appointments
+        if appointment.employee_id
+    )
+    rows = Appointment.objects.filter(
+        status='approved',
+        employee_id__in=employee_ids,
+        appointment_time__lt=max(appointment.end_time for appointment in appointments),
+        end_time__gt=min(appointment.appointment_time for appointment in appointments)
+    ).values_list('id', 'employee_id', 'appointment_time', 'end_time')
+
+    for appointment_id, employee_id, start, end in rows:
+        busy[employee_id][appointment_id] = (start, end)
+    return busy
+
+
+def apply_decisions(items):
+    """
+    Approve, reject or reassign a batch of appointments in one transaction.
+
+    Each item is {appointment_id, decision, employee_id}, where decision is
+    approve or reject (pending appointments) or reassign (approved ones).
+    Appointments and employees are locked in id order, the batch is checked
+    for conflicts against one query of existing bookings and against the
+    items before it, and the changes are written with bulk_update and
+    bulk_create, after taking reassigned appointments off their previous
+    employees. Items that fail validation are skipped and the rest are
+    applied. Returns one result per item, in order.
+    """
+    now = timezone.now()
+    results = [None] * len(items)
+    parsed = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append((index, *parse_decision(item)))
+        except ValueError as error:
+            appointment_id = item.get('appointment_id') if isinstance(item, dict) else None
+            results[index] = decision_result(appointment_id, str(error))
+
+    with transaction.atomic():
+        appointments = {
+            appointment.id: appointment
+            for appointment in Appointment.objects.select_for_update().filter(
+                id__in={appointment_id for _, appointment_id, _, _ in parsed}
+            ).order_by('id')
+        }
+        employees = {
+            employee.id: employee
+            for employee in UserProfile.objects.select_for_update().filter(
+                id__in={employee_id for _, _, _, employee_id in parsed},
+                role='employee'
+            ).order_by('id')
+        }
+
+        rejected, assignments, reassigned, pending_checks = [], [], [], []
+        seen = set()
+        for index, appointment_id, decision, employee_id in parsed:
+            appointment = appointments.get(appointment_id)
+            employee = employees.get(employee_id)
+            expected_status = 'approved' if decision == 'reassign' else 'pending'
+
+            if appointment is None:
+                error = 'Appointment not found'
+            elif appointment_id in seen:
+                error = 'Appointment appears more than once'
+            elif appointment.status != expected_status:
+                error = f'Appointment is {appointment.status}, not {expected_status}'
+            elif decision != 'reject' and employee is None:
+                error = 'Employee not found'
+            elif decision == 'approve' and appointment.appointment_time <= now:
+                error = 'Cannot approve appointments in the past'
+            else:
+                error = None
+            seen.add(appointment_id)
+
+            if error:
+                results[index] = decision_result(appointment_id, error)
+            elif decision == 'reject':
+                appointment.status = 'rejected'
+                rejected.append(appointment)
+                results[index] = decision_result(appointment_id, status='rejected')
+            elif appointment.employee_id == employee.id:
+                results[index] = decision_result(
+                    appointment_id, status=appointment.status, employee_id=employee.id
+                )
+            else:
+                pending_checks.append((index, appointment, employee))
+
+        # Check every assignment against existing bookings and the
+        # assignments accepted before it in this batch
+        busy = busy_intervals(
+            [(appointment, employee) for _, appointment, employee in pending_checks]
+        )
+        for index, appointment, employee in pending_checks:
+            start, end = appointment.appointment_time, appointment.end_time
+            if any(
+                appointments_overlap(start, end, other_start, other_end)
+                for other_id, (other_start, other_end) in busy[employee.id].items()
+                if other_id != appointment.id
+            ):
+                results[index] = decision_result(
+                    appointment.id, 'Employee is not available at this time'
+                )
+                continue
+
+            busy[appointment.employee_id].pop(appointment.id, None)
+            busy[employee.id][appointment.id] = (start, end)
+            if appointment.status == 'approved':
+                reassigned.append(appointment.id)
+            appointment.employee = employee
+            appointment.status = 'approved'
+            assignments.append(appointment)
+            results[index] = decision_result(
+                appointment.id, status='approved', employee_id=employee.id
+            )
+
+        # On PostgreSQL the exclusion constraint is checked row by row
+        # during bulk_update, so an appointment moving onto an employee
+        # could meet one moving off them that isn't updated yet. Taking
+        # reassigned appointments off their employees first can't overlap
+        # anything, and the batch was checked to fit once it is applied.
+        if reassigned:
+            Appointment.objects.filter(id__in=reassigned).update(employee=None)
+
+        changed = rejected + assignments
+        for appointment in changed:
+            appointment.updated_at = now
+        Appointment.objects.bulk_update(changed, ['employee', 'status', 'updated_at'])
+
+        EmployeeCalendar.objects.filter(appointment__in=assignments).delete()
+        EmployeeCalendar.objects.bulk_create([
+            EmployeeCalendar(
+                user_profile=appointment.employee,
+                appointment=appointment,
+                scheduled_time=appointment.appointment_time,
+                available_time=False
+            )
+            for appointment in assignments
+        ])
+
+    # bulk_update() doesn't send the signal that keeps this up to date
+    if changed:
+        invalidate_pending_count(Appointment)
+    return results
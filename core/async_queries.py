@@ -0,0 +1,20 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from asgiref.sync import sync_to_async
+
+
+async def run_queries(*functions):
+    """
+    Run blocking database calls one after another and return their
+    results in order. They go to the sync thread together, in one hop,
+    and share the request's connection rather than running concurrently
+    on connections of their own. That avoids a new connection (and TLS
+    handshake) per query, and the event loop keeps serving other requests
+    while they run.
+    """
+    def run_all():
+        return [function() for function in functions]
+    return await sync_to_async(run_all)()
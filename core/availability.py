@@ -0,0 +1,244 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from django.utils.timezone import make_aware
+from .async_queries import run_queries
+from .models import Appointment, UserProfile, EmployeeCalendar, TimeOffRequest
+
+
+def merge_intervals(intervals):
+    """
+    Merge overlapping (start, end) intervals.
+    Returns a sorted list of non-overlapping intervals.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class BusySchedule:
+    """
+    In-memory view of when each employee is busy within a time window.
+
+    Calendar entries are stored as sorted start times per employee and
+    approved time off as merged, sorted intervals, so every availability
+    check is a couple of binary searches instead of database queries.
+    """
+
+    def __init__(self, employee_ids, bookings=(), time_off=()):
+        self.employee_ids = list(employee_ids)
+        self.bookings = defaultdict(list)
+        self.time_off = defaultdict(list)
+
+        for employee_id, scheduled_time in bookings:
+            self.bookings[employee_id].append(scheduled_time)
+        for times in self.bookings.values():
+            times.sort()
+
+        raw_time_off = defaultdict(list)
+        for employee_id, start, end in time_off:
+            raw_time_off[employee_id].append((start, end))
+        for employee_id, intervals in raw_time_off.items():
+            self.time_off[employee_id] = merge_intervals(intervals)
+
+    @staticmethod
+    def window_querysets(window_start, window_end):
+        """Employee ids, bookings and approved time off for a window"""
+        employee_ids = UserProfile.objects.filter(
+            role='employee'
+        ).values_list('id', flat=True)
+
+        bookings = EmployeeCalendar.objects.filter(
+            user_profile__isnull=False,
+            scheduled_time__gte=window_start,
+            scheduled_time__lt=window_end
+        ).values_list('user_profile_id', 'scheduled_time')
+
+        time_off = TimeOffRequest.objects.filter(
+            user_profile__isnull=False,
+            status='approved',
+            start_time__lt=window_end,
+            end_time__gt=window_start
+        ).values_list('user_profile_id', 'start_time', 'end_time')
+
+        return employee_ids, bookings, time_off
+
+    @classmethod
+    def load(cls, window_start, window_end):
+        """Load every employee's bookings and approved time off for a window"""
+        return cls(*cls.window_querysets(window_start, window_end))
+
+    @classmethod
+    async def aload(cls, window_start, window_end):
+        """Async version of load"""
+        results = await run_queries(*(
+            partial(list, queryset)
+            for queryset in cls.window_querysets(window_start, window_end)
+        ))
+        return cls(*results)
+
+    def is_employee_free(self, employee_id, start, end):
+        """Check whether an employee is free for the interval [start, end)"""
+        # Any calendar entry starting inside the slot is a conflict
+        times = self.bookings.get(employee_id)
+        if times:
+            index = bisect_left(times, start)
+            if index < len(times) and times[index] < end:
+                return False
+
+        # Merged time off is sorted by both start and end, so only the
+        # last interval starting before the slot ends can overlap it
+        intervals = self.time_off.get(employee_id)
+        if intervals:
+            index = bisect_right(intervals, (end,)) - 1
+            if index >= 0 and intervals[index][1] > start:
+                return False
+
+        return True
+
+    def any_employee_free(self, start, end):
+        """Check whether at least one employee is free for [start, end)"""
+        return any(
+            self.is_employee_free(employee_id, start, end)
+            for employee_id in self.employee_ids
+        )
+
+
+@lru_cache(maxsize=128)
+def parse_start_times(allowed_start_times):
+    """
+    Parse a comma-separated start time string into (label, time) pairs.
+    Malformed entries are skipped. Results are cached per string, so each
+    service's start times are only parsed once per process.
+    """
+    parsed = []
+    for time_str in (t.strip() for t in allowed_start_times.split(",")):
+        try:
+            parsed.append(
+                (time_str, datetime.strptime(time_str, "%H:%M").time())
+            )
+        except ValueError:
+            continue  # Skip malformed times
+    return tuple(parsed)
+
+
+def slot_candidates(service, start_date, end_date):
+    """Every (time_str, start, end) a service could start at in a range"""
+    start_times = parse_start_times(service.allowed_start_times)
+
+    candidates = []
+    day = start_date
+    while day <= end_date:
+        for time_str, start_time in start_times:
+            start = make_aware(datetime.combine(day, start_time))
+            candidates.append((time_str, start, start + service.duration))
+        day += timedelta(days=1)
+    return candidates
+
+
+def candidate_window(candidates):
+    """The time window covered by a list of slot candidates"""
+    return (
+        min(start for _, start, _ in candidates),
+        max(end for _, _, end in candidates)
+    )
+
+
+def find_available_slots(service, start_date, end_date):
+    """
+    Find available slots for a service on every date from start_date to
+    end_date inclusive, using one batch of queries for the whole range.
+    Returns a list of (time_str, start, end) tuples ordered by date.
+    """
+    candidates = slot_candidates(service, start_date, end_date)
+    if not candidates:
+        return []
+
+    schedule = BusySchedule.load(*candidate_window(candidates))
+    return [
+        (time_str, start, end)
+        for time_str, start, end in candidates
+        if schedule.any_employee_free(start, end)
+    ]
+
+
+async def afind_available_slots(service, start_date, end_date):
+    """Async version of find_available_slots"""
+    candidates = slot_candidates(service, start_date, end_date)
+    if not candidates:
+        return []
+
+    schedule = await BusySchedule.aload(*candidate_window(candidates))
+    return [
+        (time_str, start, end)
+        for time_str, start, end in candidates
+        if schedule.any_employee_free(start, end)
+    ]
+
+
+def find_busy_employees(appointments):
+    """
+    Work out which employees are busy at the time of each appointment.
+
+    An employee is busy if they are assigned to an overlapping approved
+    appointment, or have an unavailable calendar entry at exactly the same
+    start time (legacy support). Approved intervals touching the overall
+    span are loaded in one query and swept against the appointments in
+    start time order.
+    Returns a dict mapping appointment id to a set of employee ids.
+    """
+    appointments = sorted(appointments, key=lambda a: a.appointment_time)
+    busy = {appointment.id: set() for appointment in appointments}
+    if not appointments:
+        return busy
+
+    span_start = appointments[0].appointment_time
+    span_end = max(appointment.get_end_time() for appointment in appointments)
+
+    approved = sorted(Appointment.objects.filter(
+        status='approved',
+        employee__isnull=False,
+        appointment_time__lt=span_end,
+        end_time__gt=span_start
+    ).values_list('appointment_time', 'end_time', 'employee_id', 'id'))
+    approved_starts = [row[0] for row in approved]
+    longest = max(
+        (end - start for start, end, _, _ in approved),
+        default=timedelta(0)
+    )
+
+    calendar = defaultdict(set)
+    for scheduled_time, employee_id in EmployeeCalendar.objects.filter(
+        scheduled_time__in={a.appointment_time for a in appointments},
+        available_time=False,
+        user_profile__isnull=False
+    ).values_list('scheduled_time', 'user_profile_id'):
+        calendar[scheduled_time].add(employee_id)
+
+    for appointment in appointments:
+        start = appointment.appointment_time
+        end = appointment.get_end_time()
+        busy_ids = busy[appointment.id]
+
+        # Only approved appointments starting within the longest duration
+        # before this one and before it ends can overlap it
+        low = bisect_right(approved_starts, start - longest)
+        high = bisect_left(approved_starts, end)
+        for _, other_end, employee_id, other_id in approved[low:high]:
+            if other_end > start and other_id != appointment.id:
+                busy_ids.add(employee_id)
+
+        busy_ids.update(calendar.get(start, ()))
+
+    return busy
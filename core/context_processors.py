@@ -1,4 +1,4 @@
-from .models import PetProfile, Appointment, UserProfile
+from .counters import get_pending_counts
 
 
 def navigation_context(request):
@@ -10,14 +10,9 @@ def navigation_context(request):
     if request.user.is_authenticated and hasattr(request.user, 'userprofile'):
         if request.user.userprofile.role == 'manager':
             # Add pending counts for manager notification badges
-            context['pending_pets_count'] = PetProfile.objects.filter(
-                profile_status='pending'
-            ).count()
-            context['pending_appointments_count'] = Appointment.objects.filter(
-                status='pending'
-            ).count()
-            context['pending_users_count'] = UserProfile.objects.filter(
-                role='pending'
-            ).count()
+            counts = get_pending_counts()
+            context['pending_pets_count'] = counts['pets']
+            context['pending_appointments_count'] = counts['appointments']
+            context['pending_users_count'] = counts['users']
 
     return context
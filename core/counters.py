@@ -0,0 +1,63 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from django.core.cache import cache
+from .models import PetProfile, Appointment, UserProfile
+
+# Counted items: counter name -> (model, filter for "pending")
+PENDING_COUNTERS = {
+    'pets': (PetProfile, {'profile_status': 'pending'}),
+    'appointments': (Appointment, {'status': 'pending'}),
+    'users': (UserProfile, {'role': 'pending'}),
+}
+
+# Cached counts expire after this long, so changes that bypass model
+# signals (e.g. queryset.update()) are still picked up eventually
+RECONCILE_INTERVAL = 120
+
+
+def counter_key(name):
+    """Cache key for a single pending counter"""
+    return f'pending_count:{name}'
+
+
+def get_pending_counts():
+    """
+    Get the number of pending pets, appointments and users.
+    Counts come from the cache and are only recalculated when missing.
+    """
+    cached = cache.get_many([counter_key(name) for name in PENDING_COUNTERS])
+
+    counts = {}
+    missing = {}
+    for name, (model, filters) in PENDING_COUNTERS.items():
+        key = counter_key(name)
+        if key in cached:
+            counts[name] = cached[key]
+        else:
+            counts[name] = model.objects.filter(**filters).count()
+            missing[key] = counts[name]
+
+    if missing:
+        cache.set_many(missing, RECONCILE_INTERVAL)
+    return counts
+
+
+def invalidate_pending_count(model):
+    """Drop the cached counter for a model so it is recounted on next use"""
+    for name, (counted_model, _) in PENDING_COUNTERS.items():
+        if counted_model is model:
+            cache.delete(counter_key(name))
+
+
+def clear_pending_counts():
+    """Drop every cached pending counter"""
+    cache.delete_many([counter_key(name) for name in PENDING_COUNTERS])
+
+
+def reconcile_pending_counts():
+    """Recalculate every pending counter and refresh the cache"""
+    clear_pending_counts()
+    return get_pending_counts()
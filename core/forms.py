@@ -17,6 +17,7 @@ from .models import (
     Service,
     ServicePrice,
     )
+from .assignments import duration_conflicts
 
 
 class PetProfileForm(forms.ModelForm):
@@ -233,6 +234,20 @@ class AppointmentApprovalForm(forms.Form):
         empty_label="Select an employee..."
     )
 
+    def __init__(self, *args, employees=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Use a precomputed list of employees to avoid a query per form
+        if employees is not None:
+            field = self.fields['employee']
+            field.queryset = UserProfile.objects.filter(
+                id__in=[employee.id for employee in employees]
+            )
+            field.choices = [('', field.empty_label)] + [
+                (employee.id, field.label_from_instance(employee))
+                for employee in employees
+            ]
+
 
 class UserApprovalForm(forms.Form):
     """Form for approving pending user registrations"""
@@ -313,8 +328,35 @@ class ServiceForm(forms.ModelForm):
                     "Service duration cannot exceed 8 hours."
                 )
 
+            # A longer service mustn't run into the employee's next booking
+            if self.instance.pk and duration > self.instance.duration:
+                conflicts = duration_conflicts(self.instance, duration)
+                if conflicts:
+                    raise forms.ValidationError(self.overlap_message(conflicts))
+
         return duration
 
+    def overlap_message(self, conflicts):
+        """Error naming the employees a longer duration would double-book"""
+        employees = sorted({str(appointment.employee) for appointment in conflicts})
+        return (
+            "This duration would create overlapping appointments for "
+            f"{', '.join(employees)}. Reassign or reschedule them first."
+        )
+
+    def add_overlap_error(self):
+        """
+        Report a save rejected by the database's overlap constraint, e.g.
+        when a booking was approved after the form was validated
+        """
+        conflicts = duration_conflicts(self.instance, self.cleaned_data['duration'])
+        if conflicts:
+            self.add_error('duration', self.overlap_message(conflicts))
+        else:
+            self.add_error(
+                'duration', "This duration would create overlapping appointments."
+            )
+
 
 class ServicePriceForm(forms.ModelForm):
     """ Form for managing service pricing """
@@ -0,0 +1,221 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import json
+import logging
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from asgiref.sync import (
+    iscoroutinefunction, markcoroutinefunction, sync_to_async
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('core.requests')
+
+# Metrics for the request currently being served (None outside requests
+# or when instrumentation is disabled)
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Timing and query statistics collected while serving one request.
+    Instances are installed as database execute wrappers, so every query
+    run during the request is counted and timed.
+    """
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.queries = 0
+        self.db_time = 0.0
+        self.spans = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def span(name):
+    """
+    Record the duration and query count of a block of code against the
+    current request. Does nothing when instrumentation is disabled.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    queries = metrics.queries
+    db_time = metrics.db_time
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.spans.append({
+            'name': name,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+            'db_ms': round((metrics.db_time - db_time) * 1000, 2),
+            'queries': metrics.queries - queries,
+        })
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request id to every log record"""
+
+    def filter(self, record):
+        metrics = current_metrics.get()
+        record.request_id = metrics.request_id if metrics else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+        }
+        entry.update(getattr(record, 'data', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+@contextmanager
+def collecting(metrics):
+    """
+    Make metrics the current request's metrics and count every query run
+    on any database connection against them
+    """
+    # Restored rather than reset with a token, as an async stream
+    # enters and leaves this in different sync_to_async calls
+    previous = current_metrics.get()
+    current_metrics.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            yield
+    finally:
+        current_metrics.set(previous)
+
+
+class RequestMetricsMiddleware:
+    """
+    Emit one structured log line per request with its duration, database
+    time, query count, status and any recorded spans.
+    Streaming responses produce their content (and run their queries)
+    after the view returns, so their line is written once the stream has
+    been sent or closed, covering the whole response.
+    Runs natively in both sync and async chains, so it doesn't push async
+    views back through a thread. Removed from the middleware chain
+    entirely unless REQUEST_METRICS_ENABLED is set.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics(self.request_id(request))
+        start = time.perf_counter()
+
+        with collecting(metrics):
+            response = self.get_response(request)
+
+            if not response.streaming:
+                self.log(request, response, metrics, start)
+
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        """
+        Async version of __call__. Queries run on the request's sync
+        thread, which has its own connection objects, so the wrappers are
+        installed and removed there.
+        """
+        metrics = RequestMetrics(self.request_id(request))
+        start = time.perf_counter()
+
+        stack = ExitStack()
+        await sync_to_async(stack.enter_context)(collecting(metrics))
+        try:
+            response = await self.get_response(request)
+
+            if not response.streaming:
+                self.log(request, response, metrics, start)
+        finally:
+            await sync_to_async(stack.close)()
+
+        return self.finish(request, response, metrics, start)
+
+    def request_id(self, request):
+        """The client's X-Request-ID, or a new one"""
+        return request.headers.get('X-Request-ID') or uuid.uuid4().hex
+
+    def finish(self, request, response, metrics, start):
+        """Measure a streamed body as it is sent and tag the response"""
+        if response.streaming:
+            stream = self.astream if response.is_async else self.stream
+            response.streaming_content = stream(
+                response.streaming_content, request, response, metrics, start
+            )
+
+        response['X-Request-ID'] = metrics.request_id
+        return response
+
+    def stream(self, content, request, response, metrics, start):
+        """Pass a streamed body through, measuring it as it is produced"""
+        with collecting(metrics):
+            try:
+                yield from content
+            finally:
+                self.log(request, response, metrics, start)
+
+    async def astream(self, content, request, response, metrics, start):
+        """
+        Async version of stream, installing the wrappers on the request's
+        sync thread like __acall__
+        """
+        stack = ExitStack()
+        await sync_to_async(stack.enter_context)(collecting(metrics))
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            self.log(request, response, metrics, start)
+            await sync_to_async(stack.close)()
+
+    def log(self, request, response, metrics, start):
+        logger.info('request', extra={'data': {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'queries': metrics.queries,
+            'spans': metrics.spans,
+        }})
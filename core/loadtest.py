@@ -0,0 +1,254 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import json
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+# Upper bounds (ms) of the latency histogram buckets
+BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf')]
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+SELECT = r'<select name="{}"[^>]*>(.*?)</select>'
+OPTION_VALUE = re.compile(r'<option value="(\d+)"')
+
+
+def bucket_label(bucket):
+    """Histogram label for a bucket upper bound"""
+    return f'<={bucket:g}ms' if bucket != float('inf') else f'>{BUCKETS[-2]:g}ms'
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0
+    index = max(0, round(percent / 100 * len(values)) - 1)
+    return values[index]
+
+
+class Stats:
+    """Thread-safe latency and error collection per endpoint"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = {}
+        self.errors = {}
+
+    def record(self, endpoint, elapsed_ms, ok):
+        with self.lock:
+            self.timings.setdefault(endpoint, []).append(elapsed_ms)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, duration):
+        """Per-endpoint throughput, latency percentiles and histogram"""
+        summary = {}
+        for endpoint, timings in sorted(self.timings.items()):
+            ordered = sorted(timings)
+            histogram = {bucket_label(bucket): 0 for bucket in BUCKETS}
+            for value in ordered:
+                bucket = next(bucket for bucket in BUCKETS if value <= bucket)
+                histogram[bucket_label(bucket)] += 1
+            summary[endpoint] = {
+                'requests': len(ordered),
+                'errors': self.errors.get(endpoint, 0),
+                'rps': round(len(ordered) / duration, 2),
+                'p50_ms': round(percentile(ordered, 50), 2),
+                'p95_ms': round(percentile(ordered, 95), 2),
+                'p99_ms': round(percentile(ordered, 99), 2),
+                'max_ms': round(ordered[-1], 2),
+                'histogram': histogram,
+            }
+        return summary
+
+
+class Session:
+    """
+    One browser-like visitor: keeps cookies, sends CSRF tokens the way the
+    site's forms and JavaScript do, and times every request.
+    """
+
+    def __init__(self, base_url, stats, timeout=30):
+        self.base_url = base_url
+        self.stats = stats
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies))
+
+    def csrf_cookie(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def request(self, endpoint, path, params=None, data=None, json_body=None):
+        """
+        Send a request and record its latency under endpoint.
+        Returns (status, final url, body); status is None on network errors.
+        """
+        url = urljoin(self.base_url, path)
+        if params:
+            url += '?' + urlencode(params)
+
+        headers = {'Referer': url}
+        body = None
+        if data is not None:
+            body = urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+            headers['X-CSRFToken'] = self.csrf_cookie()
+            headers['X-Requested-With'] = 'XMLHttpRequest'
+
+        start = time.perf_counter()
+        try:
+            with self.opener.open(Request(url, body, headers), timeout=self.timeout) as response:
+                status, final_url = response.status, response.geturl()
+                content = response.read().decode('utf-8', 'replace')
+        except HTTPError as error:
+            status, final_url = error.code, url
+            content = error.read().decode('utf-8', 'replace')
+        except (URLError, OSError):
+            status, final_url, content = None, url, ''
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats.record(endpoint, elapsed, status is not None and status < 400)
+        return status, final_url, content
+
+    def login(self, username, password):
+        """Log in through the login form; returns True on success"""
+        _, _, page = self.request('login_form', '/accounts/login/')
+        token = CSRF_INPUT.search(page)
+        status, final_url, _ = self.request('login', '/accounts/login/', data={
+            'username': username,
+            'password': password,
+            'csrfmiddlewaretoken': token.group(1) if token else '',
+        })
+        return status == 200 and '/accounts/login/' not in final_url
+
+
+def select_options(page, name):
+    """Option values of a <select> in a rendered form"""
+    match = re.search(SELECT.format(name), page, re.S)
+    return OPTION_VALUE.findall(match.group(1)) if match else []
+
+
+def browser_time_slot(start):
+    """Format a slot start the way the booking page does (toISOString)"""
+    utc = datetime.fromisoformat(start).astimezone(dt_timezone.utc)
+    return utc.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def week_range(weeks_ahead):
+    """ISO start and end of a calendar week, as FullCalendar requests it"""
+    monday = date.today() - timedelta(days=date.today().weekday())
+    start = monday + timedelta(weeks=weeks_ahead)
+    return start.isoformat(), (start + timedelta(days=7)).isoformat()
+
+
+def client_visit(session, rng, options):
+    """
+    A client opens the booking page, browses a few weeks of slots for a
+    service, checks the price and sometimes books, then sees the dashboard.
+    """
+    _, _, page = session.request('book_appointment_form', '/client/appointments/book/')
+    pets = select_options(page, 'pet_profile')
+    services = select_options(page, 'service')
+    if not pets or not services:
+        return
+
+    pet, service = rng.choice(pets), rng.choice(services)
+    slots = []
+    for weeks_ahead in range(rng.randint(1, 3)):
+        start, end = week_range(weeks_ahead)
+        status, _, body = session.request('available_slots', '/ajax/available-slots/', {
+            'service_id': service, 'start': start, 'end': end
+        })
+        if status == 200:
+            slots.extend(json.loads(body))
+        think(rng, options)
+
+    session.request('service_price', '/ajax/get-service-price/', {
+        'pet_id': pet, 'service_id': service
+    })
+    think(rng, options)
+
+    token = CSRF_INPUT.search(page)
+    if slots and token and rng.random() < options['book_rate']:
+        session.request('book_appointment', '/client/appointments/book/', data={
+            'pet_profile': pet,
+            'service': service,
+            'time_slot': browser_time_slot(rng.choice(slots)['start']),
+            'csrfmiddlewaretoken': token.group(1),
+        })
+        think(rng, options)
+
+    session.request('client_dashboard', '/client/')
+
+
+def manager_visit(session, rng, options):
+    """
+    A manager opens the appointments dashboard and calendar, then approves
+    one of the upcoming pending appointments with an available employee.
+    """
+    session.request('approve_appointments', '/manager/approve-appointments/')
+    start = date.today()
+    status, _, body = session.request('calendar_events', '/ajax/calendar-events/', {
+        'start': start.isoformat(),
+        'end': (start + timedelta(days=14)).isoformat(),
+    })
+    think(rng, options)
+    if status != 200:
+        return
+
+    pending = [
+        event['id'] for event in json.loads(body)
+        if event['extendedProps']['status'] == 'pending'
+        and not event['extendedProps']['is_past']
+    ]
+    if not pending:
+        return
+
+    appointment_id = rng.choice(pending)
+    status, _, body = session.request(
+        'available_employees', '/ajax/get-available-employees/',
+        {'appointment_id': appointment_id}
+    )
+    think(rng, options)
+    employees = json.loads(body).get('employees') if status == 200 else None
+    if employees:
+        session.request('approve_appointment', '/ajax/approve-appointment/', json_body={
+            'appointment_id': appointment_id,
+            'employee_id': rng.choice(employees)['id'],
+        })
+
+
+def employee_visit(session, rng, options):
+    """An employee checks their schedule and the shared calendar"""
+    session.request('employee_dashboard', '/employee/')
+    start, end = week_range(0)
+    session.request('calendar_events', '/ajax/calendar-events/', {
+        'start': start, 'end': end
+    })
+
+
+SCENARIOS = {
+    'client': client_visit,
+    'manager': manager_visit,
+    'employee': employee_visit,
+}
+
+
+def think(rng, options):
+    """Pause like a user reading the page"""
+    if options['think']:
+        time.sleep(rng.uniform(0, options['think']))
@@ -0,0 +1,201 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import include, path
+from django.utils import timezone
+
+from ...loadtest import percentile
+from ...models import UserProfile, PetProfile, Service, Appointment
+from ...slot_cache import clear_slot_cache
+from ...views import api_views, async_api_views
+
+AJAX_VIEWS = [
+    'fetch_available_slots', 'get_service_price',
+    'get_calendar_events', 'get_available_employees',
+]
+
+
+class BenchmarkURLs:
+    """URLconf serving the sync and async AJAX views side by side"""
+    urlpatterns = [
+        path(f'{mode}/{name}/', getattr(views, name), name=f'{mode}_{name}')
+        for mode, views in [('sync', api_views), ('async', async_api_views)]
+        for name in AJAX_VIEWS
+    ] + [path('', include('core.urls'))]
+
+
+class Command(BaseCommand):
+    """
+    Compare throughput and latency of the read-only AJAX endpoints under
+    concurrent load, served by the sync views with a fixed number of
+    workers (like gunicorn's sync worker class) and by the async views on
+    one event loop (like a single uvicorn worker).
+
+    Requests go through the full middleware stack against the data in the
+    current database, so fill it with generate_load_data first.
+    """
+    help = "Benchmark the sync and async AJAX views at several concurrency levels"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 10, 50],
+            help="Numbers of simultaneous requests to test"
+        )
+        parser.add_argument('--requests', type=int, default=200,
+                            help="Requests per mode and concurrency level")
+        parser.add_argument(
+            '--workers', type=int, default=3,
+            help="Requests the sync deployment can serve at once"
+        )
+
+    def handle(self, *args, **options):
+        requests = self.build_requests()
+
+        # Static files may not have been collected in this environment
+        storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        with override_settings(ROOT_URLCONF=BenchmarkURLs, ALLOWED_HOSTS=['*'],
+                               STATICFILES_STORAGE=storage):
+            for concurrency in options['concurrency']:
+                self.stdout.write(f"Concurrency {concurrency}:")
+                total = max(options['requests'], concurrency)
+                for mode, run in [
+                    (f'sync ({options["workers"]} workers)', self.run_sync),
+                    ('async', self.run_async),
+                ]:
+                    clear_slot_cache()
+                    started = time.perf_counter()
+                    timings, errors = run(
+                        requests, concurrency, total, options['workers']
+                    )
+                    elapsed = time.perf_counter() - started
+                    self.report(mode, timings, errors, elapsed)
+
+    def build_requests(self):
+        """
+        One (user, name, params) request per endpoint, for a client with
+        a verified pet and a manager.
+        """
+        manager = UserProfile.objects.filter(
+            role='manager'
+        ).select_related('user').order_by('id').first()
+        pet = PetProfile.objects.filter(
+            profile_status='verified'
+        ).select_related('user').order_by('id').first()
+        service = Service.objects.filter(is_active=True).order_by('id').first()
+        appointment = Appointment.objects.filter(
+            status='pending'
+        ).order_by('appointment_time').first()
+        if not (manager and pet and service and appointment):
+            raise CommandError(
+                "Need a manager, a verified pet, an active service and a "
+                "pending appointment - run generate_load_data first"
+            )
+
+        today = timezone.localdate()
+        tomorrow = today + timedelta(days=1)
+        return [
+            (pet.user, 'fetch_available_slots', {
+                'service_id': service.id,
+                'start': tomorrow.isoformat(),
+                'end': (tomorrow + timedelta(days=6)).isoformat(),
+            }),
+            (pet.user, 'get_service_price', {
+                'pet_id': pet.id, 'service_id': service.id,
+            }),
+            (manager.user, 'get_calendar_events', {
+                'start': (today - timedelta(days=7)).isoformat(),
+                'end': (today + timedelta(days=35)).isoformat(),
+            }),
+            (manager.user, 'get_available_employees', {
+                'appointment_id': appointment.id,
+            }),
+        ]
+
+    def run_sync(self, requests, concurrency, total, workers):
+        """
+        Send total requests from concurrency threads, of which at most
+        workers are served at a time. Latency includes the wait for a worker.
+        """
+        clients = self.logged_in(Client, requests)
+        available_workers = threading.Semaphore(workers)
+        timings, errors = [], []
+        lock = threading.Lock()
+
+        def visitor(index):
+            try:
+                for number in range(index, total, concurrency):
+                    user, name, params = requests[number % len(requests)]
+                    start = time.perf_counter()
+                    with available_workers:
+                        response = clients[user].get(f'/sync/{name}/', params)
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    with lock:
+                        timings.append((time.perf_counter() - start) * 1000)
+                        if response.status_code != 200:
+                            errors.append(name)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=visitor, args=(index,))
+            for index in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return timings, errors
+
+    def run_async(self, requests, concurrency, total, workers):
+        """Send total requests from concurrency tasks on one event loop"""
+        clients = self.logged_in(AsyncClient, requests)
+        timings, errors = [], []
+
+        async def visitor(index):
+            for number in range(index, total, concurrency):
+                user, name, params = requests[number % len(requests)]
+                start = time.perf_counter()
+                response = await clients[user].get(f'/async/{name}/', params)
+                if response.streaming:
+                    b''.join([chunk async for chunk in response.streaming_content])
+                timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors.append(name)
+
+        async def main():
+            await asyncio.gather(*(visitor(index) for index in range(concurrency)))
+
+        asyncio.run(main())
+        return timings, errors
+
+    def logged_in(self, client_class, requests):
+        """One logged in test client per user"""
+        clients = {}
+        for user, _, _ in requests:
+            if user not in clients:
+                clients[user] = client_class()
+                clients[user].force_login(user)
+        return clients
+
+    def report(self, mode, timings, errors, elapsed):
+        ordered = sorted(timings)
+        line = (
+            f"  {mode}: {len(ordered) / elapsed:.1f} req/s, "
+            f"p50 {percentile(ordered, 50):.2f} ms, "
+            f"p95 {percentile(ordered, 95):.2f} ms"
+        )
+        if errors:
+            self.stdout.write(self.style.ERROR(f"{line}, {len(errors)} errors"))
+        else:
+            self.stdout.write(line)
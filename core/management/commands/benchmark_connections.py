@@ -0,0 +1,102 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import statistics
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ...loadtest import percentile
+
+
+class Command(BaseCommand):
+    """
+    Compare per-request latency of the calendar endpoint with a new
+    database connection per request (CONN_MAX_AGE=0) against persistent
+    connections. Run it against the real database - the difference comes
+    from connection setup, which is negligible with SQLite.
+    """
+    help = "Benchmark calendar request latency with and without persistent connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=50,
+            help="Number of requests per mode"
+        )
+        parser.add_argument(
+            '--max-age', type=int,
+            default=settings.DATABASES['default']['CONN_MAX_AGE'] or 60,
+            help="CONN_MAX_AGE to compare against a new connection per request"
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        url = reverse('get_calendar_events')
+        params = {
+            'start': (today - timedelta(days=7)).isoformat(),
+            'end': (today + timedelta(days=35)).isoformat(),
+        }
+
+        results = {}
+        for label, max_age in [('new connection', 0),
+                               (f'persistent ({options["max_age"]}s)', options['max_age'])]:
+            results[label] = self.measure(url, params, max_age, options['requests'])
+
+        for label, (timings, opened) in results.items():
+            self.stdout.write(
+                f"{label}: median {statistics.median(timings):.2f} ms, "
+                f"p95 {percentile(sorted(timings), 95):.2f} ms, "
+                f"{opened} connections opened"
+            )
+
+        baseline, persistent = (
+            statistics.median(timings) for timings, _ in results.values()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Median latency change: {persistent - baseline:+.2f} ms per request"
+        ))
+
+    def measure(self, url, params, max_age, count):
+        """
+        Time count calendar requests with the given CONN_MAX_AGE.
+        Returns the timings in milliseconds and the connections opened.
+        """
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        client = Client()
+        timings = []
+
+        # The test client skips the connection handling Django does at the
+        # start and end of real requests, so it is done explicitly here.
+        # The first request warms up URL resolution and imports.
+        connection_created.connect(count_connection)
+        try:
+            with override_settings(ALLOWED_HOSTS=['*']):
+                for i in range(count + 1):
+                    start = time.perf_counter()
+                    close_old_connections()
+                    response = client.get(url, params)
+                    b''.join(response.streaming_content)
+                    close_old_connections()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if i:
+                        timings.append(elapsed)
+        finally:
+            connection_created.disconnect(count_connection)
+
+        connection.close()
+        return timings, len(opened)
@@ -0,0 +1,241 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import io
+import json
+import statistics
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ...counters import clear_pending_counts
+from ...models import UserProfile, PetProfile, Service, Appointment
+from ...slot_cache import clear_slot_cache
+from ...utils import get_available_slots
+
+
+class Command(BaseCommand):
+    """
+    Measure wall time and query count of the booking hot paths.
+
+    Each scale generates a synthetic dataset with generate_load_data
+    inside a transaction that is rolled back afterwards; --existing
+    measures the current database instead. Caches are invalidated before
+    every run, so the numbers reflect the work done rather than cache hits.
+    Results can be written as JSON and compared against an earlier run.
+    """
+    help = "Benchmark the booking hot paths and compare against a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', type=int, nargs='+', default=[100, 1000],
+            help="Numbers of generated clients to benchmark with"
+        )
+        parser.add_argument(
+            '--existing', action='store_true',
+            help="Benchmark the data already in the database instead"
+        )
+        parser.add_argument('--years', type=int, default=1,
+                            help="Years of generated appointment history")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--repeat', type=int, default=5,
+                            help="Runs per endpoint (the median is reported)")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--baseline', help="JSON results to compare against")
+        parser.add_argument(
+            '--tolerance', type=float, default=25,
+            help="Allowed median time increase over the baseline, in percent"
+        )
+        parser.add_argument(
+            '--min-delta', type=float, default=2,
+            help="Ignore median time increases smaller than this many ms"
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        scales = ['existing'] if options['existing'] else options['scales']
+
+        results = {}
+        for scale in scales:
+            self.stdout.write(f"Scale {scale}:")
+            results[str(scale)] = self.run_scale(scale, options)
+
+        report = {
+            'database': connection.vendor,
+            'created': timezone.now().isoformat(),
+            'repeat': self.repeat,
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline:
+                self.compare(
+                    json.load(baseline), report,
+                    options['tolerance'], options['min_delta']
+                )
+
+    def run_scale(self, scale, options):
+        """Measure every endpoint against one dataset"""
+        with transaction.atomic():
+            if scale != 'existing':
+                call_command(
+                    'generate_load_data', clients=scale, years=options['years'],
+                    seed=options['seed'], employees=max(3, scale // 100),
+                    clear=True, stdout=io.StringIO()
+                )
+
+            # Static files may not have been collected in this environment
+            storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+            with override_settings(STATICFILES_STORAGE=storage,
+                                   ALLOWED_HOSTS=['*']):
+                results = {
+                    name: self.measure(name, run)
+                    for name, run in self.endpoints()
+                }
+
+            transaction.set_rollback(True)
+
+        # Don't leave anything computed from rolled back data in the cache
+        clear_pending_counts()
+        clear_slot_cache()
+        return results
+
+    def endpoints(self):
+        """Build (name, callable) pairs for every benchmarked path"""
+        manager = User.objects.create(username='benchmark_manager')
+        UserProfile.objects.create(user=manager, role='manager')
+        manager_client = Client()
+        manager_client.force_login(manager)
+
+        pet = PetProfile.objects.filter(
+            profile_status='verified'
+        ).select_related('user').order_by('id').first()
+        service = Service.objects.filter(is_active=True).order_by('id').first()
+        appointment = Appointment.objects.filter(
+            status='pending'
+        ).order_by('appointment_time').first()
+        if not (pet and service and appointment):
+            raise CommandError(
+                "Need a verified pet, an active service and a pending appointment"
+            )
+
+        client = Client()
+        client.force_login(pet.user)
+
+        today = timezone.localdate()
+        tomorrow = today + timedelta(days=1)
+
+        def get(user_client, name, **params):
+            def run():
+                response = user_client.get(reverse(name), params)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                return response.status_code
+            return run
+
+        def slots(days):
+            return get(
+                client, 'fetch_available_slots', service_id=service.id,
+                start=tomorrow.isoformat(),
+                end=(tomorrow + timedelta(days=days - 1)).isoformat()
+            )
+
+        def slots_for_day():
+            get_available_slots(service, tomorrow)
+            return 200
+
+        return [
+            ('get_available_slots', slots_for_day),
+            ('fetch_available_slots_week', slots(7)),
+            ('fetch_available_slots_month', slots(30)),
+            ('get_calendar_events', get(
+                manager_client, 'get_calendar_events',
+                start=(today - timedelta(days=7)).isoformat(),
+                end=(today + timedelta(days=35)).isoformat()
+            )),
+            ('approve_appointments', get(manager_client, 'approve_appointments')),
+            ('client_dashboard', get(client, 'client_dashboard')),
+            ('approve_users', get(manager_client, 'approve_users')),
+            ('get_available_employees', get(
+                manager_client, 'get_available_employees',
+                appointment_id=appointment.id
+            )),
+        ]
+
+    def measure(self, name, run):
+        """Time one endpoint over several runs with cold caches"""
+        run()  # Warm up imports, URL resolution and template loading
+        timings = []
+        queries = 0
+        for _ in range(self.repeat):
+            clear_pending_counts()
+            clear_slot_cache()
+
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                status = run()
+                timings.append((time.perf_counter() - start) * 1000)
+
+            if status != 200:
+                raise CommandError(f"{name} returned status {status}")
+            queries = max(queries, len(captured))
+
+        result = {
+            'median_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': queries,
+        }
+        self.stdout.write(
+            f"  {name}: {result['median_ms']} ms median, {queries} queries"
+        )
+        return result
+
+    def compare(self, baseline, report, tolerance, min_delta):
+        """Report changes against a baseline and fail on regressions"""
+        if baseline.get('database') != report['database']:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded on {baseline.get('database')}, "
+                f"not {report['database']}"
+            ))
+
+        regressions = []
+        for scale, endpoints in report['results'].items():
+            for name, current in endpoints.items():
+                previous = baseline['results'].get(scale, {}).get(name)
+                if previous is None:
+                    continue
+
+                delta = current['median_ms'] - previous['median_ms']
+                change = (
+                    delta / previous['median_ms'] * 100
+                    if previous['median_ms'] else 0
+                )
+                line = (
+                    f"{scale} {name}: {previous['median_ms']} -> "
+                    f"{current['median_ms']} ms ({change:+.0f}%), "
+                    f"{previous['queries']} -> {current['queries']} queries"
+                )
+                slower = change > tolerance and delta > min_delta
+                if current['queries'] > previous['queries'] or slower:
+                    regressions.append(f"{scale} {name}")
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Regressions: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
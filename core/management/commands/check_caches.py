@@ -0,0 +1,99 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import multiprocessing
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def write_from_other_process(alias, key):
+    """Write a key from a separate worker process"""
+    import django
+    django.setup()
+    from django.core.cache import caches
+    caches[alias].set(key, 'shared', 60)
+
+
+class Command(BaseCommand):
+    """
+    Exercise every configured cache alias against the backend chosen by
+    CACHE_URL: basic reads and writes, atomic counters (used by rate
+    limiting), isolation between aliases and whether values are visible
+    to other worker processes.
+    Run it with e.g. CACHE_URL=file:///tmp/dog-cache as a local stand-in
+    for a shared cache server.
+    """
+    help = "Check the configured caches work and are shared between processes"
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"CACHE_URL scheme: {settings.CACHE_URL.split(':')[0]}")
+        run = uuid.uuid4().hex
+        failures = []
+
+        for alias in settings.CACHES:
+            try:
+                shared = self.check_alias(alias, run)
+            except Exception as exc:
+                failures.append(alias)
+                self.stdout.write(self.style.ERROR(f"{alias}: {exc}"))
+                continue
+
+            backend = settings.CACHES[alias]['BACKEND'].rsplit('.', 1)[-1]
+            if shared:
+                self.stdout.write(self.style.SUCCESS(f"{alias}: {backend}, shared"))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f"{alias}: {backend}, NOT shared between worker processes"
+                ))
+
+        if failures:
+            raise CommandError(f"Cache checks failed for: {', '.join(failures)}")
+
+    def check_alias(self, alias, run):
+        """Run the checks for one alias and report whether it is shared"""
+        cache = caches[alias]
+        key = f'check_caches:{run}'
+
+        cache.set(key, 'value', 60)
+        if cache.get(key) != 'value':
+            raise AssertionError("value written could not be read back")
+
+        for other in settings.CACHES:
+            if other != alias and caches[other].get(key) is not None:
+                raise AssertionError(f"keys leak into the '{other}' alias")
+
+        if cache.add(key, 'other', 60):
+            raise AssertionError("add() overwrote an existing key")
+
+        counter = f'{key}:counter'
+        cache.set(counter, 1, 60)
+        if cache.incr(counter) != 2 or cache.get(counter) != 2:
+            raise AssertionError("incr() did not update the counter")
+
+        cache.set_many({f'{key}:a': 1, f'{key}:b': 2}, 60)
+        if cache.get_many([f'{key}:a', f'{key}:b']) != {f'{key}:a': 1, f'{key}:b': 2}:
+            raise AssertionError("get_many() did not return set_many() values")
+
+        cache.delete_many([key, counter, f'{key}:a', f'{key}:b'])
+        if cache.get(key) is not None:
+            raise AssertionError("deleted key is still present")
+
+        # Database connections must not be shared with the child process
+        shared_key = f'{key}:shared'
+        connections.close_all()
+        process = multiprocessing.get_context('spawn').Process(
+            target=write_from_other_process, args=(alias, shared_key)
+        )
+        process.start()
+        process.join(30)
+        if process.exitcode != 0:
+            raise AssertionError("worker process could not write to the cache")
+
+        shared = cache.get(shared_key) == 'shared'
+        cache.delete(shared_key)
+        return shared
@@ -0,0 +1,154 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ...counters import clear_pending_counts
+from ...models import (
+    UserProfile, PetProfile, Service, Appointment, EmployeeCalendar
+)
+from ...views import approve_appointments
+
+STATUS_CYCLE = ['pending', 'approved', 'rejected']
+
+# Most queries the dashboard may take to render, at any scale
+QUERY_BUDGET = 12
+
+
+def create_dataset(scale):
+    """
+    Create a manager, five employees, one client and scale appointments
+    cycling through pending, approved and rejected. Returns the manager.
+    """
+    manager = User.objects.create(username='budget_manager')
+    UserProfile.objects.create(user=manager, role='manager')
+
+    employees = [
+        UserProfile.objects.create(
+            user=User.objects.create(username=f'budget_employee_{i}'),
+            role='employee'
+        )
+        for i in range(5)
+    ]
+
+    client = User.objects.create(username='budget_client')
+    UserProfile.objects.create(user=client, role='client')
+    pet = PetProfile.objects.create(
+        user=client,
+        name='Budget',
+        breed='Mixed',
+        date_of_birth=timezone.now().date() - timedelta(days=1000),
+        profile_status='verified',
+        size='medium'
+    )
+    service = Service.objects.create(
+        name='Budget Groom',
+        duration=timedelta(hours=1),
+        allowed_start_times='09:00,11:00,14:00'
+    )
+
+    start = timezone.now() + timedelta(days=1)
+    appointments = []
+    for i in range(scale):
+        appointment_time = start + timedelta(hours=i)
+        status = STATUS_CYCLE[i % len(STATUS_CYCLE)]
+        appointments.append(Appointment(
+            pet_profile=pet,
+            service=service,
+            appointment_time=appointment_time,
+            end_time=appointment_time + service.duration,
+            employee=employees[i % len(employees)]
+            if status == 'approved' else None,
+            status=status
+        ))
+    Appointment.objects.bulk_create(appointments)
+
+    EmployeeCalendar.objects.bulk_create([
+        EmployeeCalendar(
+            user_profile=appointment.employee,
+            appointment=appointment,
+            scheduled_time=appointment.appointment_time,
+            available_time=False
+        )
+        for appointment in appointments
+        if appointment.status == 'approved'
+    ])
+
+    return manager
+
+
+class Command(BaseCommand):
+    """
+    Render the appointments dashboard against throwaway datasets of
+    different sizes and fail if the number of queries grows with the data
+    or exceeds the budget. All data is rolled back afterwards.
+    """
+    help = "Check the appointments dashboard renders in a fixed number of queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', type=int, nargs='+', default=[10, 100, 1000],
+            help="Numbers of appointments to render the dashboard with"
+        )
+        parser.add_argument(
+            '--budget', type=int, default=QUERY_BUDGET,
+            help="Maximum number of queries allowed per render"
+        )
+
+    def handle(self, *args, **options):
+        counts = {}
+        for scale in options['scales']:
+            counts[scale] = self.measure(scale)
+            self.stdout.write(f"{scale} appointments: {counts[scale]} queries")
+
+        if len(set(counts.values())) > 1:
+            raise CommandError(
+                f"Query count grows with the number of appointments: {counts}"
+            )
+        if max(counts.values()) > options['budget']:
+            raise CommandError(
+                f"Dashboard exceeds the budget of {options['budget']} "
+                f"queries: {counts}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Query budget respected."))
+
+    def measure(self, scale):
+        """Count the queries needed to render the dashboard for one scale"""
+        with transaction.atomic():
+            manager = create_dataset(scale)
+
+            request = RequestFactory().get(
+                reverse('approve_appointments'), SERVER_NAME='localhost'
+            )
+            request.user = manager
+
+            # Measure with cold pending counters so results don't depend
+            # on what an earlier scale left in the cache
+            clear_pending_counts()
+
+            # Static files may not have been collected in this environment
+            storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+            with override_settings(STATICFILES_STORAGE=storage):
+                with CaptureQueriesContext(connection) as queries:
+                    response = approve_appointments(request)
+
+            transaction.set_rollback(True)
+
+        # Don't leave counts for the rolled back data in the cache
+        clear_pending_counts()
+
+        if response.status_code != 200:
+            raise CommandError(
+                f"Dashboard returned status {response.status_code}"
+            )
+        return len(queries)
@@ -0,0 +1,117 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ...models import (
+    UserProfile, PetProfile, Appointment, EmployeeCalendar, TimeOffRequest
+)
+
+
+def hot_queries(now):
+    """
+    The most frequent filters in the app, each with the indexes that may
+    serve it. Any listed index appearing in the plan counts as a pass.
+    """
+    week = timedelta(days=7)
+    return [
+        ("Pending appointment queue",
+         Appointment.objects.filter(status='pending').order_by('appointment_time'),
+         ['appointment_pending_time_idx', 'appointment_status_time_idx']),
+        ("Approved appointment overlap",
+         Appointment.objects.filter(
+             status='approved', employee__isnull=False,
+             appointment_time__gt=now - week, appointment_time__lt=now,
+             end_time__gt=now - week
+         ),
+         ['appointment_status_time_idx', 'appointment_employee_span_idx']),
+        ("Employee schedule",
+         Appointment.objects.filter(
+             employee_id=1, appointment_time__range=(now, now + week)
+         ).order_by('appointment_time'),
+         ['appointment_employee_span_idx']),
+        ("Client appointments",
+         Appointment.objects.filter(
+             pet_profile__user_id=1, appointment_time__gte=now,
+             status__in=['pending', 'approved']
+         ).order_by('appointment_time'),
+         ['pet_profile_id', 'petprofile_user_id']),
+        ("Calendar bookings in window",
+         EmployeeCalendar.objects.filter(
+             user_profile__isnull=False,
+             scheduled_time__gte=now, scheduled_time__lt=now + week
+         ),
+         ['calendar_time_available_idx']),
+        ("Employee busy at time",
+         EmployeeCalendar.objects.filter(
+             user_profile_id=1, scheduled_time=now, available_time=False
+         ),
+         ['calendar_profile_time_idx']),
+        ("Approved time off in window",
+         TimeOffRequest.objects.filter(
+             status='approved', start_time__lt=now + week, end_time__gt=now
+         ),
+         ['timeoff_approved_span_idx']),
+        ("Employee time off by status",
+         TimeOffRequest.objects.filter(user_profile_id=1, status='pending'),
+         ['timeoff_profile_status_idx']),
+        ("Pending pet queue",
+         PetProfile.objects.filter(profile_status='pending'),
+         ['petprofile_pending_idx', 'petprofile_status_name_idx']),
+        ("Verified pet directory",
+         PetProfile.objects.filter(
+             profile_status='verified'
+         ).order_by('name', 'id'),
+         ['petprofile_status_name_idx']),
+        ("Pending user queue",
+         UserProfile.objects.filter(role='pending').order_by('created_at'),
+         ['userprofile_role_created_idx']),
+        ("Employees",
+         UserProfile.objects.filter(role='employee'),
+         ['userprofile_role_created_idx']),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN on the hottest queries and fail if any of them is not
+    answered from one of its indexes. On PostgreSQL sequential scans are
+    disabled for the check, so small development tables still show which
+    index the planner would pick once the tables grow.
+    """
+    help = "Check the hottest queries are served by indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose-plans', action='store_true',
+            help="Print the full plan for every query"
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for label, queryset, indexes in hot_queries(timezone.now()):
+                plan = queryset.explain()
+                used = [name for name in indexes if name in plan]
+                if used:
+                    self.stdout.write(f"{label}: {used[0]}")
+                else:
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"{label}: no index scan"))
+                if options['verbose_plans'] or not used:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"Queries not using an index: {', '.join(failures)}")
+
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
@@ -0,0 +1,394 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import random
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import make_aware
+
+from ...availability import parse_start_times
+from ...counters import clear_pending_counts
+from ...models import (
+    UserProfile, PetProfile, Service, ServicePrice, Appointment,
+    EmployeeCalendar, TimeOffRequest, Voucher
+)
+
+# Generated users and vouchers are recognisable by these prefixes
+USERNAME_PREFIX = 'load_'
+VOUCHER_PREFIX = 'LD'
+
+FIRST_NAMES = [
+    'Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Jamie', 'Chris', 'Robin',
+    'Charlie', 'Casey', 'Riley', 'Avery', 'Quinn', 'Harper', 'Rowan', 'Kai',
+]
+LAST_NAMES = [
+    'Smith', 'Jones', 'Williams', 'Brown', 'Taylor', 'Davies', 'Evans',
+    'Wilson', 'Thomas', 'Roberts', 'Walker', 'Wright', 'Green', 'Hall',
+]
+PET_NAMES = [
+    'Bella', 'Max', 'Luna', 'Charlie', 'Daisy', 'Milo', 'Poppy', 'Teddy',
+    'Rosie', 'Buddy', 'Willow', 'Archie', 'Bonnie', 'Alfie', 'Ruby', 'Otis',
+]
+BREEDS = [
+    'Labrador', 'Cocker Spaniel', 'Poodle', 'Border Collie', 'Dachshund',
+    'French Bulldog', 'Golden Retriever', 'Shih Tzu', 'Beagle', 'Whippet',
+]
+
+# Used when the database has no active services yet:
+# name, duration in minutes, allowed start times, price per size
+DEFAULT_SERVICES = [
+    ('Full Groom', 120, '09:00,11:30,14:30',
+     {'small': '45.00', 'medium': '60.00', 'large': '80.00'}),
+    ('Bath and Brush', 60, '09:00,10:00,11:00,13:00,14:00,15:00,16:00',
+     {'small': '25.00', 'medium': '35.00', 'large': '45.00'}),
+    ('Nail Trim', 30, '09:00,09:30,10:00,10:30,13:00,13:30,14:00,14:30',
+     {'small': '10.00', 'medium': '12.00', 'large': '15.00'}),
+]
+DEFAULT_PRICE = Decimal('50.00')
+SIZES = ['small', 'medium', 'large']
+
+# Status weights for appointments in the past and in the future
+PAST_STATUSES = (['approved', 'completed', 'canceled', 'rejected'], [70, 15, 10, 5])
+FUTURE_STATUSES = (['pending', 'approved', 'rejected'], [40, 50, 10])
+# Appointments are booked up to this far ahead of --today
+BOOKING_HORIZON = timedelta(days=30)
+
+
+class Command(BaseCommand):
+    """
+    Generate a realistic, deterministic dataset for performance work:
+    clients with pets, employees with time off, years of appointments
+    with matching calendar entries, and vouchers.
+
+    Rows are written with bulk_create in batches. Approved appointments
+    never double-book an employee or fall on their approved time off,
+    each pet has at most one appointment per start time, and every
+    service used has a price for each size. The same --seed and --today
+    always produce the same data.
+    """
+    help = "Generate a synthetic dataset of clients, pets and appointments"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--employees', type=int, default=10)
+        parser.add_argument('--years', type=int, default=1,
+                            help="Years of appointment history")
+        parser.add_argument('--visits-per-year', type=int, default=6,
+                            help="Average appointments per pet per year")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--today', type=date.fromisoformat,
+                            help="Date the history ends at, YYYY-MM-DD "
+                                 "(default: today)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--password', default='loadtest-password',
+                            help="Password for every generated user")
+        parser.add_argument('--clear', action='store_true',
+                            help="Delete previously generated data first")
+
+    def handle(self, *args, **options):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError(
+                "The database must return ids from bulk inserts "
+                "(PostgreSQL or SQLite 3.35+)"
+            )
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.today = options['today'] or date.today()
+        self.start_date = self.today - timedelta(days=365 * options['years'])
+        self.end_date = self.today + BOOKING_HORIZON
+        self.now = make_aware(datetime.combine(self.today, time(12)))
+
+        with transaction.atomic():
+            if options['clear']:
+                self.clear()
+            elif User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+                raise CommandError(
+                    "Generated data already exists, use --clear to replace it"
+                )
+
+            password = make_password(options['password'])
+            services = self.ensure_services()
+            employees = self.create_employees(options['employees'], password)
+            clients = self.create_clients(options['clients'], password)
+            pets = self.create_pets(clients)
+            days_off = self.create_time_off(employees)
+            appointments, calendar = self.create_appointments(
+                pets, services, employees, days_off,
+                options['years'] * options['visits_per_year']
+            )
+            vouchers = self.create_vouchers(clients)
+
+        # Bulk inserts bypass the signals that keep this up to date
+        clear_pending_counts()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(employees)} employees, {len(clients)} clients, "
+            f"{len(pets)} pets, {appointments} appointments, "
+            f"{calendar} calendar entries and {vouchers} vouchers"
+        ))
+
+    def clear(self):
+        """Delete everything created by a previous run"""
+        Voucher.objects.filter(code__startswith=VOUCHER_PREFIX).delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def bulk_create(self, model, objects):
+        """Insert objects in batches, returning them with primary keys"""
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def random_datetime(self, start_date, end_date):
+        """Random aware datetime during the working day between two dates"""
+        day = start_date + timedelta(
+            days=self.rng.randint(0, (end_date - start_date).days)
+        )
+        return make_aware(datetime.combine(
+            day, time(self.rng.randint(8, 17), self.rng.choice([0, 15, 30, 45]))
+        ))
+
+    def ensure_services(self):
+        """
+        Get the active services (creating defaults if there are none) and
+        make sure each has a price for every size.
+        Returns a list of (service, start times, prices by size).
+        """
+        services = list(Service.objects.filter(is_active=True).order_by('id'))
+        if not services:
+            services = self.bulk_create(Service, [
+                Service(
+                    name=name,
+                    duration=timedelta(minutes=minutes),
+                    allowed_start_times=start_times,
+                )
+                for name, minutes, start_times, _ in DEFAULT_SERVICES
+            ])
+            default_prices = {name: prices for name, _, _, prices in DEFAULT_SERVICES}
+        else:
+            default_prices = {}
+
+        existing = {
+            (price.service_id, price.size): price.price
+            for price in ServicePrice.objects.filter(service__in=services)
+        }
+        missing = [
+            ServicePrice(
+                service=service, size=size,
+                price=Decimal(default_prices.get(service.name, {}).get(
+                    size, DEFAULT_PRICE
+                ))
+            )
+            for service in services
+            for size in SIZES
+            if (service.id, size) not in existing
+        ]
+        for price in self.bulk_create(ServicePrice, missing):
+            existing[(price.service_id, price.size)] = price.price
+
+        usable = []
+        for service in services:
+            start_times = parse_start_times(service.allowed_start_times)
+            if start_times:
+                usable.append((
+                    service, [start for _, start in start_times],
+                    {size: existing[(service.id, size)] for size in SIZES}
+                ))
+        if not usable:
+            raise CommandError("No active service has valid start times")
+        return usable
+
+    def create_users(self, kind, count, password):
+        """Create count users named load_<kind>_<n>"""
+        users = []
+        for number in range(count):
+            username = f'{USERNAME_PREFIX}{kind}_{number:06d}'
+            users.append(User(
+                username=username,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'{username}@example.com',
+                password=password,
+            ))
+        return self.bulk_create(User, users)
+
+    def create_employees(self, count, password):
+        """Create employee users and profiles"""
+        users = self.create_users('employee', count, password)
+        return self.bulk_create(UserProfile, [
+            UserProfile(
+                user=user,
+                role='employee',
+                start_date=self.start_date - timedelta(days=self.rng.randint(0, 1500)),
+                salary=Decimal(self.rng.randrange(22000, 35000, 500)),
+            )
+            for user in users
+        ])
+
+    def create_clients(self, count, password):
+        """Create client users and profiles, a few still pending approval"""
+        users = self.create_users('client', count, password)
+        profiles = self.bulk_create(UserProfile, [
+            UserProfile(
+                user=user,
+                role='pending' if self.rng.random() < 0.03 else 'client'
+            )
+            for user in users
+        ])
+        return [profile.user for profile in profiles if profile.role == 'client']
+
+    def create_pets(self, clients):
+        """Create one to three pets per client, most of them verified"""
+        pets = []
+        for user in clients:
+            for _ in range(self.rng.choice([1, 1, 1, 2, 2, 3])):
+                status = self.rng.choices(
+                    ['verified', 'pending', 'rejected'], [85, 10, 5]
+                )[0]
+                pets.append(PetProfile(
+                    user=user,
+                    name=self.rng.choice(PET_NAMES),
+                    breed=self.rng.choice(BREEDS),
+                    size=self.rng.choice(SIZES) if status == 'verified' else None,
+                    date_of_birth=self.today - timedelta(
+                        days=self.rng.randint(120, 15 * 365)
+                    ),
+                    profile_status=status,
+                    verified_at=(
+                        self.random_datetime(self.start_date, self.today)
+                        if status == 'verified' else None
+                    ),
+                ))
+        return self.bulk_create(PetProfile, pets)
+
+    def create_time_off(self, employees):
+        """
+        Create a few time off requests per employee per year.
+        Returns the set of (employee id, date) covered by approved time off.
+        """
+        requests = []
+        days_off = set()
+        years = max(1, (self.end_date - self.start_date).days // 365)
+        for employee in employees:
+            for _ in range(3 * years):
+                first_day = self.start_date + timedelta(
+                    days=self.rng.randint(0, (self.end_date - self.start_date).days)
+                )
+                length = self.rng.randint(1, 5)
+                status = self.rng.choices(
+                    ['approved', 'pending', 'rejected'], [70, 20, 10]
+                )[0]
+                requests.append(TimeOffRequest(
+                    user_profile=employee,
+                    start_time=make_aware(datetime.combine(first_day, time.min)),
+                    end_time=make_aware(datetime.combine(
+                        first_day + timedelta(days=length), time.min
+                    )),
+                    approved=status == 'approved',
+                    status=status,
+                ))
+                if status == 'approved':
+                    days_off.update(
+                        (employee.id, first_day + timedelta(days=offset))
+                        for offset in range(length)
+                    )
+        self.bulk_create(TimeOffRequest, requests)
+        return days_off
+
+    def create_appointments(self, pets, services, employees, days_off, visits):
+        """
+        Create appointments for every verified pet, and a calendar entry
+        for each one assigned to an employee. Rows are flushed in batches
+        so memory use does not grow with the size of the history.
+        Returns the number of appointments and calendar entries created.
+        """
+        busy = defaultdict(list)  # (employee id, date) -> [(start, end)]
+        pending = []
+        totals = [0, 0]
+        span_days = (self.end_date - self.start_date).days
+
+        def flush():
+            created = self.bulk_create(Appointment, pending)
+            totals[0] += len(created)
+            totals[1] += len(self.bulk_create(EmployeeCalendar, [
+                EmployeeCalendar(
+                    user_profile_id=appointment.employee_id,
+                    appointment=appointment,
+                    scheduled_time=appointment.appointment_time,
+                    available_time=False,
+                )
+                for appointment in created if appointment.employee_id
+            ]))
+            pending.clear()
+
+        for pet in pets:
+            if pet.profile_status != 'verified':
+                continue
+
+            booked = set()
+            for _ in range(self.rng.randint(visits // 2, visits + visits // 2)):
+                service, start_times, prices = self.rng.choice(services)
+                day = self.start_date + timedelta(days=self.rng.randint(0, span_days))
+                start = make_aware(datetime.combine(day, self.rng.choice(start_times)))
+                if start in booked:
+                    continue  # One appointment per pet per start time
+                booked.add(start)
+                end = start + service.duration
+
+                statuses, weights = PAST_STATUSES if start < self.now else FUTURE_STATUSES
+                status = self.rng.choices(statuses, weights)[0]
+
+                employee_id = None
+                if status in ('approved', 'completed'):
+                    employee_id = self.assign_employee(
+                        employees, days_off, busy, day, start, end
+                    )
+                    if employee_id is None:
+                        status = 'rejected'  # Fully booked
+
+                pending.append(Appointment(
+                    pet_profile=pet,
+                    service=service,
+                    appointment_time=start,
+                    end_time=end,
+                    employee_id=employee_id,
+                    status=status,
+                    final_price=prices[pet.size],
+                ))
+                if len(pending) >= self.batch_size:
+                    flush()
+
+        if pending:
+            flush()
+        return totals
+
+    def assign_employee(self, employees, days_off, busy, day, start, end):
+        """Pick an employee free for [start, end) and mark them busy"""
+        for employee in self.rng.sample(employees, len(employees)):
+            if (employee.id, day) in days_off:
+                continue
+            intervals = busy[(employee.id, day)]
+            if all(end <= other_start or start >= other_end
+                   for other_start, other_end in intervals):
+                intervals.append((start, end))
+                return employee.id
+        return None
+
+    def create_vouchers(self, clients):
+        """Create one voucher per ten clients, some already redeemed"""
+        vouchers = []
+        for number in range(len(clients) // 10):
+            redeemed = self.rng.random() < 0.3
+            vouchers.append(Voucher(
+                code=f'{VOUCHER_PREFIX}{number:08d}',
+                discount_percentage=Decimal(self.rng.choice([5, 10, 15, 20])),
+                expiry_date=self.today + timedelta(days=self.rng.randint(-180, 365)),
+                is_redeemed=redeemed,
+                used_by_user=self.rng.choice(clients) if redeemed else None,
+            ))
+        return len(self.bulk_create(Voucher, vouchers))
@@ -0,0 +1,147 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import json
+import random
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from ...loadtest import SCENARIOS, Session, Stats
+
+
+def parse_mix(value):
+    """Parse a traffic mix such as 'client=85,manager=10,employee=5'"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+class Command(BaseCommand):
+    """
+    Replay booking-day traffic against a running server over HTTP.
+
+    Concurrent virtual users log in as the clients and employees created by
+    generate_load_data (and a manager account given on the command line),
+    then browse slots, check prices, book, and approve appointments through
+    the real URLs. Prints throughput, latency percentiles and a latency
+    histogram per endpoint. The Django database is not touched, so the
+    server can be local or remote.
+    """
+    help = "Run an HTTP load test against a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--users', type=int, default=10,
+                            help="Concurrent virtual users")
+        parser.add_argument('--duration', type=float, default=60,
+                            help="Seconds to run for")
+        parser.add_argument('--ramp-up', type=float, default=10,
+                            help="Seconds over which users are started")
+        parser.add_argument('--mix', type=parse_mix,
+                            default='client=85,manager=10,employee=5',
+                            help="Relative weights of the client, manager "
+                                 "and employee scenarios")
+        parser.add_argument('--clients', type=int, default=1000,
+                            help="Number of generated clients to log in as")
+        parser.add_argument('--employees', type=int, default=10,
+                            help="Number of generated employees to log in as")
+        parser.add_argument('--password', default='loadtest-password',
+                            help="Password of the generated users")
+        parser.add_argument('--manager', help="Manager username")
+        parser.add_argument('--manager-password')
+        parser.add_argument('--think', type=float, default=1.0,
+                            help="Maximum pause between requests, in seconds")
+        parser.add_argument('--book-rate', type=float, default=0.3,
+                            help="Share of client visits that book")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help="Write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        mix = {name: weight for name, weight in options['mix'].items() if weight > 0}
+        if not mix:
+            raise CommandError("The traffic mix has no scenarios")
+        if 'manager' in mix and not options['manager']:
+            raise CommandError("The manager scenario needs --manager")
+
+        self.options = options
+        self.mix = mix
+        self.stats = Stats()
+        self.deadline = time.monotonic() + options['duration']
+
+        threads = []
+        delay = options['ramp_up'] / max(1, options['users'])
+        for index in range(options['users']):
+            thread = threading.Thread(target=self.virtual_user, args=(index,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(delay)
+        for thread in threads:
+            thread.join()
+
+        summary = self.stats.summary(options['duration'])
+        self.report(summary)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'options': {
+                    key: options[key] for key in (
+                        'base_url', 'users', 'duration', 'think', 'book_rate'
+                    )
+                }, 'mix': mix, 'endpoints': summary}, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def credentials(self, scenario, rng):
+        """Pick a user to play a scenario as"""
+        options = self.options
+        if scenario == 'manager':
+            return options['manager'], options['manager_password']
+        if scenario == 'employee':
+            number = rng.randrange(options['employees'])
+            return f'load_employee_{number:06d}', options['password']
+        number = rng.randrange(options['clients'])
+        return f'load_client_{number:06d}', options['password']
+
+    def virtual_user(self, index):
+        """Run scenarios until the deadline, reusing logged in sessions"""
+        rng = random.Random(self.options['seed'] * 1000 + index)
+        names, weights = list(self.mix), list(self.mix.values())
+        sessions = {}
+
+        while time.monotonic() < self.deadline:
+            scenario = rng.choices(names, weights)[0]
+            username, password = self.credentials(scenario, rng)
+
+            session = sessions.get(username)
+            if session is None:
+                session = Session(self.options['base_url'], self.stats)
+                if not session.login(username, password):
+                    continue
+                sessions[username] = session
+
+            SCENARIOS[scenario](session, rng, self.options)
+
+    def report(self, summary):
+        """Print the per-endpoint results"""
+        total = sum(result['requests'] for result in summary.values())
+        self.stdout.write(
+            f"{total} requests in {self.options['duration']:g}s "
+            f"({total / self.options['duration']:.1f}/s)\n"
+        )
+        for endpoint, result in summary.items():
+            self.stdout.write(
+                f"{endpoint}: {result['requests']} requests "
+                f"({result['rps']}/s), {result['errors']} errors, "
+                f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+                f"p99 {result['p99_ms']} ms"
+            )
+            peak = max(result['histogram'].values())
+            for label, count in result['histogram'].items():
+                if count:
+                    bar = '#' * max(1, round(count / peak * 40))
+                    self.stdout.write(f"  {label:>10} {count:>7} {bar}")
@@ -0,0 +1,24 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from django.core.management.base import BaseCommand
+
+from ...counters import reconcile_pending_counts
+
+
+class Command(BaseCommand):
+    """
+    Recalculate the cached pending counters shown to managers.
+    Intended to be run periodically (e.g. by Heroku Scheduler) to correct
+    any drift from changes that bypass model signals.
+    """
+    help = "Recalculate cached pending pet, appointment and user counts"
+
+    def handle(self, *args, **options):
+        counts = reconcile_pending_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Pending counts: {counts['pets']} pets, "
+            f"{counts['appointments']} appointments, {counts['users']} users"
+        ))
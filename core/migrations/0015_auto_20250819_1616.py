@@ -3,6 +3,17 @@
 from django.db import migrations
 
 
+def drop_auditlog_table(apps, schema_editor):
+    """
+    Remove a leftover core_auditlog table. CASCADE is PostgreSQL syntax,
+    and on a fresh database 0014 has already removed the table, so other
+    databases (e.g. SQLite for the test suite) have nothing to do here.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS core_auditlog CASCADE;")
+
+
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -10,8 +21,5 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.RunSQL(
-            "DROP TABLE IF EXISTS core_auditlog CASCADE;",
-            reverse_sql="-- No reverse operation for manual table cleanup"
-        ),
+        migrations.RunPython(drop_auditlog_table, migrations.RunPython.noop),
     ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-16 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_auto_20250819_1616'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['status', 'appointment_time'], name='appointment_status_time_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.23 on 2026-10-16 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_appointment_status_time_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='end_time',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Appointment time plus service duration, kept in sync on save', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['employee', 'appointment_time', 'end_time'], name='appointment_employee_span_idx'),
+        ),
+    ]
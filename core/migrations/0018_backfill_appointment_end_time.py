@@ -0,0 +1,41 @@
+# Generated by Django 4.2.23 on 2026-10-16 23:55
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_end_time(apps, schema_editor):
+    """Populate end_time for existing appointments in primary key chunks"""
+    Appointment = apps.get_model('core', 'Appointment')
+
+    last_id = 0
+    while True:
+        rows = list(
+            Appointment.objects.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'appointment_time', 'service__duration'
+            )[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+
+        batch = [
+            Appointment(
+                id=appointment_id,
+                end_time=(start + duration) if duration else start
+            )
+            for appointment_id, start, duration in rows
+        ]
+        Appointment.objects.bulk_update(batch, ['end_time'])
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_appointment_end_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_end_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.23 on 2026-10-17 00:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_backfill_appointment_end_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeecalendar',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='timeoffrequest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-17 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_calendar_timeoff_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['appointment_time'], name='appointment_pending_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeecalendar',
+            index=models.Index(fields=['user_profile', 'scheduled_time', 'available_time'], name='calendar_profile_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeecalendar',
+            index=models.Index(fields=['scheduled_time', 'available_time'], name='calendar_time_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='petprofile',
+            index=models.Index(condition=models.Q(('profile_status', 'pending')), fields=['created_at'], name='petprofile_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='petprofile',
+            index=models.Index(fields=['profile_status', 'verified_at'], name='petprofile_status_verified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeoffrequest',
+            index=models.Index(fields=['user_profile', 'status', 'start_time', 'end_time'], name='timeoff_profile_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeoffrequest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['start_time', 'end_time'], name='timeoff_approved_span_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['role', 'created_at'], name='userprofile_role_created_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.23 on 2026-10-17 10:12
+
+from django.db import migrations
+
+CONSTRAINT = 'appointment_employee_no_overlap'
+
+FIND_OVERLAPS = """
+    SELECT earlier.id, later.id
+    FROM core_appointment earlier
+    JOIN core_appointment later
+      ON later.employee_id = earlier.employee_id
+     AND later.id > earlier.id
+     AND later.appointment_time < earlier.end_time
+     AND earlier.appointment_time < later.end_time
+    WHERE earlier.status = 'approved' AND later.status = 'approved'
+    LIMIT 20
+"""
+
+
+def add_overlap_constraint(apps, schema_editor):
+    """
+    Make PostgreSQL reject approved appointments that overlap for the
+    same employee. Other databases rely on the check in assign_employee.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(FIND_OVERLAPS)
+        overlaps = cursor.fetchall()
+    if overlaps:
+        pairs = ', '.join(f'{earlier}/{later}' for earlier, later in overlaps)
+        raise RuntimeError(
+            f"Approved appointments overlap for the same employee "
+            f"(appointment ids {pairs}). Reassign or reject them first."
+        )
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        f"ALTER TABLE core_appointment ADD CONSTRAINT {CONSTRAINT} "
+        f"EXCLUDE USING gist ("
+        f"employee_id WITH =, "
+        f"tstzrange(appointment_time, end_time) WITH &&"
+        f") WHERE (status = 'approved' AND employee_id IS NOT NULL "
+        f"AND end_time IS NOT NULL)"
+    )
+
+
+def remove_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f"ALTER TABLE core_appointment DROP CONSTRAINT IF EXISTS {CONSTRAINT}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_overlap_constraint, remove_overlap_constraint),
+    ]
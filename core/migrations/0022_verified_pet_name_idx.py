@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-17 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_appointment_employee_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='petprofile',
+            index=models.Index(condition=models.Q(('profile_status', 'verified')), fields=['name', 'id'], name='petprofile_verified_name_idx'),
+        ),
+    ]
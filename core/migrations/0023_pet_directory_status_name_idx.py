@@ -0,0 +1,25 @@
+# Generated by Django 4.2.23 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_verified_pet_name_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='petprofile',
+            name='petprofile_status_verified_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='petprofile',
+            name='petprofile_verified_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='petprofile',
+            index=models.Index(fields=['profile_status', 'name', 'id'], name='petprofile_status_name_idx'),
+        ),
+    ]
@@ -3,7 +3,7 @@ Dog Booking System
 Author: Kerem Haeger
 Created: August 2025
 """
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.contrib.auth.models import User
 
@@ -28,6 +28,15 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Employee lookups and the pending user queue (oldest first)
+            models.Index(
+                fields=['role', 'created_at'],
+                name='userprofile_role_created_idx'
+            ),
+        ]
+
     def __str__(self):
         """ Return full name if available, otherwise username """
         full_name = self.user.get_full_name()
@@ -70,6 +79,22 @@ class PetProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Pending pet queue for managers
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(profile_status='pending'),
+                name='petprofile_pending_idx'
+            ),
+            # Pet directory pages by status, in name order. Not partial,
+            # so SQLite can use it for a parameterised status as well
+            models.Index(
+                fields=['profile_status', 'name', 'id'],
+                name='petprofile_status_name_idx'
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -98,6 +123,27 @@ class Service(models.Model):
     def get_allowed_times(self):
         return [t.strip() for t in self.allowed_start_times.split(",")]
 
+    def save(self, *args, **kwargs):
+        """
+        Keep stored end times of upcoming appointments in sync with the
+        duration. Past appointments keep the length they were booked for.
+        """
+        old_duration = None
+        if self.pk:
+            old_duration = Service.objects.filter(
+                pk=self.pk
+            ).values_list('duration', flat=True).first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if old_duration is not None and old_duration != self.duration:
+                Appointment.objects.filter(
+                    service=self, appointment_time__gte=timezone.now()
+                ).update(
+                    end_time=models.F('appointment_time') + self.duration
+                )
+
     def __str__(self):
         return self.name
 
@@ -140,6 +186,12 @@ class Appointment(models.Model):
     )
     service = models.ForeignKey(Service, on_delete=models.CASCADE, null=True)
     appointment_time = models.DateTimeField()  # Appointment date and time
+    end_time = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Appointment time plus service duration, kept in sync on save"
+    )
     employee = models.ForeignKey(
         UserProfile,
         on_delete=models.SET_NULL,
@@ -169,6 +221,24 @@ class Appointment(models.Model):
     class Meta:
         """ Prevent double-booking"""
         unique_together = ('pet_profile', 'appointment_time')
+        indexes = [
+            # Supports the overlap lookup by status and start time range
+            models.Index(
+                fields=['status', 'appointment_time'],
+                name='appointment_status_time_idx'
+            ),
+            # Per-employee interval lookups
+            models.Index(
+                fields=['employee', 'appointment_time', 'end_time'],
+                name='appointment_employee_span_idx'
+            ),
+            # Pending appointment queue for managers
+            models.Index(
+                fields=['appointment_time'],
+                condition=models.Q(status='pending'),
+                name='appointment_pending_time_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.pet_profile.name} - {self.service.name} at {self.appointment_time}"
@@ -179,6 +249,19 @@ class Appointment(models.Model):
             return self.appointment_time + self.service.duration
         return self.appointment_time  # Fallback if no duration is set
 
+    def save(self, *args, **kwargs):
+        """
+        Store the calculated end time alongside the start time. Past
+        appointments keep the end they were booked with, even if the
+        service's duration has changed since.
+        """
+        if self.end_time is None or self.appointment_time >= timezone.now():
+            self.end_time = self.get_end_time()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'end_time'}
+        super().save(*args, **kwargs)
+
     @property
     def can_edit(self):
         """Check if this appointment can be edited by the client"""
@@ -236,6 +319,21 @@ class EmployeeCalendar(models.Model):
         blank=True
         )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Existing entry checks when approving or reassigning
+            models.Index(
+                fields=['user_profile', 'scheduled_time', 'available_time'],
+                name='calendar_profile_time_idx'
+            ),
+            # Busy employees by time across all staff
+            models.Index(
+                fields=['scheduled_time', 'available_time'],
+                name='calendar_time_available_idx'
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -261,6 +359,22 @@ class TimeOffRequest(models.Model):
         ('rejected', 'Rejected')
     ], default='pending')  # Time off request status
     requested_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # An employee's requests by status and period
+            models.Index(
+                fields=['user_profile', 'status', 'start_time', 'end_time'],
+                name='timeoff_profile_status_idx'
+            ),
+            # Approved time off overlapping a window, across all staff
+            models.Index(
+                fields=['start_time', 'end_time'],
+                condition=models.Q(status='approved'),
+                name='timeoff_approved_span_idx'
+            ),
+        ]
 
     def duration(self):
         return self.end_time - self.start_time  # Returns a timedelta object
@@ -0,0 +1,57 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from functools import reduce
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def after_condition(ordering, values):
+    """
+    Filter for rows that come after the given values in the ordering:
+    a > x OR (a = x AND (b > y OR (b = y AND ...)))
+    """
+    condition = Q(**{f'{ordering[-1]}__gt': values[-1]})
+    for field, value in zip(reversed(ordering[:-1]), reversed(values[:-1])):
+        condition = Q(**{f'{field}__gt': value}) | (Q(**{field: value}) & condition)
+    return condition
+
+
+def keyset_page(queryset, ordering, after, per_page):
+    """
+    One page of a queryset in the order of the given fields, which
+    together must be unique. after holds the ordering values of the last
+    row of the previous page, so every page is a range scan from a known
+    key and costs the same as the first, unlike an OFFSET.
+
+    Returns the rows and the values to continue from, which are None on
+    the last page. A cursor that doesn't fit the ordering starts over
+    from the first page.
+    """
+    if after and len(after) == len(ordering):
+        try:
+            queryset = queryset.filter(after_condition(ordering, after))
+        except (ValueError, TypeError, ValidationError):
+            pass
+
+    rows = list(queryset.order_by(*ordering)[:per_page + 1])
+    if len(rows) <= per_page:
+        return rows, None
+
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, [
+        str(reduce(getattr, field.split('__'), last)) for field in ordering
+    ]
+
+
+def page_query(params, after=None):
+    """Query string for another page, keeping the other GET parameters"""
+    params = params.copy()
+    if after:
+        params.setlist('after', after)
+    else:
+        params.pop('after', None)
+    return params.urlencode()
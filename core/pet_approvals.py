@@ -0,0 +1,68 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from .counters import invalidate_pending_count
+from .forms import PetApprovalForm
+from .models import PetProfile
+
+
+def submitted_pet_decisions(data):
+    """
+    Validate the approval forms that were actually submitted, found by
+    their <pet id>-decision fields. Returns {pet id: (decision, size)}
+    for the valid ones and the number of invalid ones.
+    """
+    decisions = {}
+    invalid = 0
+    for key in data:
+        pet_id, _, field = key.partition('-')
+        if field != 'decision' or not pet_id.isdigit():
+            continue
+        form = PetApprovalForm(data, prefix=pet_id)
+        if form.is_valid():
+            decisions[int(pet_id)] = (
+                form.cleaned_data['decision'], form.cleaned_data['size']
+            )
+        else:
+            invalid += 1
+    return decisions, invalid
+
+
+def apply_pet_decisions(decisions):
+    """
+    Apply {pet id: (decision, size)} to pending pets in one transaction,
+    with one UPDATE per assigned size for approvals and one for
+    rejections. Pets reviewed since the page was loaded are left alone.
+    Returns the numbers of pets approved and rejected.
+    """
+    approve_by_size = defaultdict(list)
+    reject_ids = []
+    for pet_id, (decision, size) in decisions.items():
+        if decision == 'approve':
+            approve_by_size[size].append(pet_id)
+        else:
+            reject_ids.append(pet_id)
+
+    now = timezone.now()
+    pending = PetProfile.objects.filter(profile_status='pending')
+    approved = rejected = 0
+    with transaction.atomic():
+        for size, ids in approve_by_size.items():
+            approved += pending.filter(id__in=ids).update(
+                profile_status='verified', size=size,
+                verified_at=now, updated_at=now
+            )
+        if reject_ids:
+            rejected = pending.filter(id__in=reject_ids).update(
+                profile_status='rejected', updated_at=now
+            )
+
+    # update() doesn't send the signal that keeps this up to date
+    if approved or rejected:
+        invalidate_pending_count(PetProfile)
+    return approved, rejected
@@ -0,0 +1,122 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from collections import defaultdict
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .counters import invalidate_pending_count
+from .models import UserProfile
+
+# Rows handled per statement when processing the pending user queue.
+# Small queues are handled in a single statement.
+BATCH_SIZE = 1000
+
+
+def in_batches(ids, batch_size):
+    """Split a list of ids into consecutive batches"""
+    for start in range(0, len(ids), batch_size):
+        yield ids[start:start + batch_size]
+
+
+def approve_pending_users(role='client', batch_size=BATCH_SIZE, progress=None):
+    """
+    Give every pending user a role with one UPDATE per batch, all in one
+    transaction. progress(done, total) is called after every batch.
+    Returns the number of users approved.
+    """
+    with transaction.atomic():
+        ids = list(UserProfile.objects.select_for_update().filter(
+            role='pending'
+        ).order_by('id').values_list('id', flat=True))
+
+        done = 0
+        for batch in in_batches(ids, batch_size):
+            done += UserProfile.objects.filter(id__in=batch).update(
+                role=role, updated_at=timezone.now()
+            )
+            if progress:
+                progress(done, len(ids))
+
+    # update() doesn't send the signal that keeps this up to date
+    invalidate_pending_count(UserProfile)
+    return done
+
+
+def reject_pending_users(batch_size=BATCH_SIZE, progress=None):
+    """
+    Delete every pending user account with their profiles and anything
+    else that cascades from them, all in one transaction. Each batch is a
+    single delete, so related rows are collected once per batch rather
+    than once per user. progress(done, total) is called after every batch.
+    Returns the number of users deleted.
+    """
+    with transaction.atomic():
+        ids = list(User.objects.filter(
+            userprofile__role='pending'
+        ).order_by('id').values_list('id', flat=True))
+
+        done = 0
+        for batch in in_batches(ids, batch_size):
+            # Skip anyone approved since the ids were read
+            _, deleted = User.objects.filter(
+                id__in=batch, userprofile__role='pending'
+            ).delete()
+            done += deleted.get(User._meta.label, 0)
+            if progress:
+                progress(done, len(ids))
+
+    return done
+
+
+def submitted_roles(data):
+    """{profile id: role} from the role_<id> fields of a submitted form"""
+    valid_roles = {role for role, _ in UserProfile.USER_ROLES}
+    roles = {}
+    for key, value in data.items():
+        prefix, _, profile_id = key.partition('_')
+        if prefix == 'role' and profile_id.isdigit() and value in valid_roles:
+            roles[int(profile_id)] = value
+    return roles
+
+
+def change_roles(roles, exclude_user=None):
+    """
+    Apply {profile id: role} changes. Only profiles whose role actually
+    changes are fetched (one query) and written (one bulk_update).
+    Returns a list of (username, old role, new role).
+    """
+    ids_by_role = defaultdict(list)
+    for profile_id, role in roles.items():
+        ids_by_role[role].append(profile_id)
+    if not ids_by_role:
+        return []
+
+    changed = Q()
+    for role, ids in ids_by_role.items():
+        changed |= Q(id__in=ids) & ~Q(role=role)
+
+    with transaction.atomic():
+        profiles = list(
+            UserProfile.objects.select_for_update(of=('self',)).filter(
+                changed
+            ).exclude(user=exclude_user).select_related('user').only(
+                'id', 'role', 'user__username'
+            ).order_by('id')
+        )
+
+        changes = []
+        now = timezone.now()
+        for profile in profiles:
+            changes.append((profile.user.username, profile.role, roles[profile.id]))
+            profile.role = roles[profile.id]
+            profile.updated_at = now
+        UserProfile.objects.bulk_update(profiles, ['role', 'updated_at'])
+
+    # bulk_update() doesn't send the signal that keeps this up to date
+    if any('pending' in (old, new) for _, old, new in changes):
+        invalidate_pending_count(UserProfile)
+    return changes
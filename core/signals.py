@@ -0,0 +1,34 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .counters import invalidate_pending_count
+from .models import PetProfile, Appointment, UserProfile
+
+# User fields shown on the calendar, see CALENDAR_EVENT_COLUMNS
+DISPLAYED_USER_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver([post_save, post_delete], sender=PetProfile)
+@receiver([post_save, post_delete], sender=Appointment)
+@receiver([post_save, post_delete], sender=UserProfile)
+def refresh_pending_counts(sender, **kwargs):
+    """Recount pending items whenever a counted model changes"""
+    invalidate_pending_count(sender)
+
+
+@receiver(post_save, sender=User)
+def touch_renamed_profile(sender, instance, created, update_fields, **kwargs):
+    """
+    auth_user has no update time, so record renames on the profile, where
+    calendar_version picks them up. Saves of other fields only (e.g.
+    last_login on every login) are ignored.
+    """
+    if created or (update_fields and not DISPLAYED_USER_FIELDS & set(update_fields)):
+        return
+    UserProfile.objects.filter(user=instance).update(updated_at=timezone.now())
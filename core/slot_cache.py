@@ -0,0 +1,108 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+from django.core.cache import caches
+from .availability import afind_available_slots, find_available_slots
+from .versioning import make_etag
+
+
+def slot_cache():
+    """Cache holding computed slots (bounded, least recently used evicted)"""
+    return caches['slots']
+
+
+# Part of every slot key, bumped to drop all cached slots at once. Every
+# alias shares the CACHE_URL server, so clearing the slots cache itself
+# would also flush rate limits and counters on Redis or a database cache.
+GENERATION_KEY = 'slots:generation'
+
+
+def slot_generation():
+    """Current generation of cached slots"""
+    return slot_cache().get_or_set(GENERATION_KEY, 0, timeout=None)
+
+
+async def aslot_generation():
+    """Async version of slot_generation"""
+    return await slot_cache().aget_or_set(GENERATION_KEY, 0, timeout=None)
+
+
+def clear_slot_cache():
+    """Drop every cached slot list, leaving other cache aliases alone"""
+    try:
+        slot_cache().incr(GENERATION_KEY)
+    except ValueError:
+        slot_cache().add(GENERATION_KEY, 1, timeout=None)
+
+
+def slot_cache_key(service, day, version, generation):
+    """
+    Cache key for a service's slots on one date. version is that date's
+    part of the slots_version the ETag is built from, read from the
+    database on every request, so any change to bookings, time off,
+    employees or the service leads to a new key in every worker, whatever
+    the cache backend. Reading it takes three small indexed queries over
+    the range, where working out the slots loads every booking in it.
+    """
+    return f'slots:{generation}:{service.id}:{day.isoformat()}:{make_etag(version)}'
+
+
+def slots_by_date(slots, days):
+    """Split find_available_slots results into {date: slots} for days"""
+    by_date = {day: [] for day in days}
+    for slot in slots:
+        day = slot[1].date()
+        if day in by_date:
+            by_date[day].append(slot)
+    return by_date
+
+
+def cached_available_slots(service, versions):
+    """
+    Same as find_available_slots for the dates of versions, a
+    slots_version. Each date is cached on its own, so overlapping ranges
+    (this week, then this month) share their dates and only the dates
+    missing from the cache, or changed since, are worked out again, in
+    one batch.
+    """
+    generation = slot_generation()
+    keys = {
+        day: slot_cache_key(service, day, version, generation)
+        for day, version in versions.items()
+    }
+    cached = slot_cache().get_many(keys.values())
+
+    missing = [day for day, key in keys.items() if key not in cached]
+    if missing:
+        computed = slots_by_date(
+            find_available_slots(service, missing[0], missing[-1]), missing
+        )
+        fresh = {keys[day]: computed[day] for day in missing}
+        slot_cache().set_many(fresh)
+        cached.update(fresh)
+
+    return [slot for key in keys.values() for slot in cached[key]]
+
+
+async def acached_available_slots(service, versions):
+    """Async version of cached_available_slots"""
+    generation = await aslot_generation()
+    keys = {
+        day: slot_cache_key(service, day, version, generation)
+        for day, version in versions.items()
+    }
+    cached = await slot_cache().aget_many(keys.values())
+
+    missing = [day for day, key in keys.items() if key not in cached]
+    if missing:
+        computed = slots_by_date(
+            await afind_available_slots(service, missing[0], missing[-1]),
+            missing
+        )
+        fresh = {keys[day]: computed[day] for day in missing}
+        await slot_cache().aset_many(fresh)
+        cached.update(fresh)
+
+    return [slot for key in keys.values() for slot in cached[key]]
@@ -0,0 +1,952 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import importlib.util
+import os
+import tempfile
+import json
+import logging
+import unittest
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from unittest import mock
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from booking_system.cache_urls import parse_cache_url
+from .assignments import (
+    OVERLAP_CONSTRAINT, EmployeeUnavailable, assign_employee
+)
+from .availability import afind_available_slots, find_available_slots
+from .counters import clear_pending_counts, get_pending_counts
+from .pagination import keyset_page
+from .instrumentation import RequestMetricsMiddleware
+from .models import (
+    UserProfile, PetProfile, Service, Appointment, EmployeeCalendar,
+    TimeOffRequest
+)
+from .slot_cache import (
+    acached_available_slots, cached_available_slots, clear_slot_cache
+)
+from .management.commands.check_query_budget import QUERY_BUDGET, create_dataset
+from .versioning import calendar_version, slots_version
+from .views import approve_appointments
+from .views.api_views import MAX_BULK_DECISIONS
+from .views.manager_views import pet_directory, user_directory
+
+# Queries the appointments dashboard takes to render, whatever the number
+# of appointments: the employees, the pending queue and the bookings that
+# decide who is free for it, the three pending counters and the history
+DASHBOARD_QUERIES = 8
+
+
+@override_settings(
+    # Static files aren't collected for tests
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+class DashboardQueryBudgetTests(TestCase):
+    """The appointments dashboard renders in a fixed number of queries"""
+
+    def setUp(self):
+        clear_pending_counts()
+
+    def assertDashboardQueries(self, scale):
+        manager = create_dataset(scale)
+        request = RequestFactory().get(reverse('approve_appointments'))
+        request.user = manager
+
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            response = approve_appointments(request)
+        self.assertEqual(response.status_code, 200)
+
+    def test_budget(self):
+        self.assertLessEqual(DASHBOARD_QUERIES, QUERY_BUDGET)
+
+    def test_10_appointments(self):
+        self.assertDashboardQueries(10)
+
+    def test_100_appointments(self):
+        self.assertDashboardQueries(100)
+
+    def test_1000_appointments(self):
+        self.assertDashboardQueries(1000)
+
+
+class CacheUrlTests(SimpleTestCase):
+    """Cache settings built from CACHE_URL"""
+
+    def test_locmem_aliases_are_separate_caches(self):
+        self.assertEqual(parse_cache_url('locmem://booking', 'slots'), {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'booking-slots',
+        })
+
+    def test_file_aliases_get_their_own_directory(self):
+        config = parse_cache_url('file:///tmp/dog-cache/', 'ratelimit')
+        self.assertEqual(config['LOCATION'], '/tmp/dog-cache/ratelimit')
+
+    def test_shared_servers_separate_aliases_by_prefix(self):
+        for url in ('db://dog_cache', 'redis://localhost:6379/0'):
+            with self.subTest(url=url):
+                config = parse_cache_url(url, 'template_fragments')
+                self.assertEqual(config['KEY_PREFIX'], 'template_fragments')
+
+        self.assertEqual(
+            parse_cache_url('db://dog_cache', 'default')['LOCATION'], 'dog_cache'
+        )
+        self.assertEqual(
+            parse_cache_url('rediss://host:6380/1', 'default')['LOCATION'],
+            'rediss://host:6380/1'
+        )
+
+    def test_extra_settings_are_kept(self):
+        config = parse_cache_url('locmem://booking', 'slots', TIMEOUT=3600)
+        self.assertEqual(config['TIMEOUT'], 3600)
+
+    def test_max_entries_only_for_backends_django_culls(self):
+        for url in ('locmem://booking', 'file:///tmp/dog-cache', 'db://dog_cache'):
+            with self.subTest(url=url):
+                config = parse_cache_url(url, 'slots', max_entries=5000)
+                self.assertEqual(config['OPTIONS'], {'MAX_ENTRIES': 5000})
+
+        for url in ('redis://localhost:6379/0', 'rediss://host:6380/1'):
+            with self.subTest(url=url):
+                config = parse_cache_url(url, 'slots', max_entries=5000)
+                self.assertNotIn('OPTIONS', config)
+
+    def redis_settings_caches(self):
+        """CACHES from booking_system/settings.py with a Redis CACHE_URL"""
+        url = 'redis://localhost:6379/0'
+        with mock.patch.dict(os.environ, {'CACHE_URL': url}):
+            spec = importlib.util.spec_from_file_location(
+                'booking_system.redis_settings',
+                settings.BASE_DIR / 'booking_system' / 'settings.py'
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        return module.CACHES
+
+    def test_settings_with_redis(self):
+        configs = self.redis_settings_caches()
+        for alias, config in configs.items():
+            with self.subTest(alias=alias):
+                self.assertEqual(
+                    config['BACKEND'],
+                    'django.core.cache.backends.redis.RedisCache'
+                )
+                self.assertEqual(config['KEY_PREFIX'], alias)
+                self.assertEqual(config.get('OPTIONS', {}), {})
+        self.assertEqual(configs['slots']['TIMEOUT'], 3600)
+
+    @unittest.skipUnless(redis, "redis isn't installed")
+    def test_redis_connections_accept_the_slots_options(self):
+        config = self.redis_settings_caches()['slots']
+        params = dict(config, OPTIONS=config.get('OPTIONS', {}))
+        cache = RedisCache(config['LOCATION'], params)
+        # Builds a connection the way a lookup would, without connecting
+        pool = cache._cache._get_connection_pool(write=False)
+        pool.make_connection()
+
+    def test_unsupported_scheme(self):
+        with self.assertRaises(ValueError):
+            parse_cache_url('memcached://localhost:11211', 'default')
+
+
+class SharedCacheTests(SimpleTestCase):
+    """
+    check_caches against a file-based cache, the local stand-in for a
+    shared cache server, and against the per-process default
+    """
+
+    def check_caches(self, url):
+        """Run check_caches with every alias configured from url"""
+        configs = {
+            alias: parse_cache_url(url, alias) for alias in settings.CACHES
+        }
+        output = StringIO()
+        # Worker processes started by the command read CACHE_URL themselves
+        with mock.patch.dict(os.environ, {'CACHE_URL': url}), \
+                override_settings(CACHE_URL=url, CACHES=configs):
+            call_command('check_caches', stdout=output)
+        return output.getvalue()
+
+    def test_file_cache_is_shared_between_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = self.check_caches(f'file://{directory}')
+
+        for alias in settings.CACHES:
+            self.assertIn(f'{alias}: FileBasedCache, shared', output)
+        self.assertNotIn('NOT shared', output)
+
+    def test_locmem_cache_is_not_shared(self):
+        output = self.check_caches('locmem://tests')
+        for alias in settings.CACHES:
+            self.assertIn(f'{alias}: LocMemCache, NOT shared', output)
+
+
+# Every alias on one store told apart by key prefix, like Redis or a
+# database cache
+SHARED_CACHES = {
+    alias: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+        'KEY_PREFIX': alias,
+    }
+    for alias in ('default', 'ratelimit', 'slots', 'template_fragments')
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ClearSlotCacheTests(SimpleTestCase):
+    """Dropping cached slots on a cache server shared by every alias"""
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def cached_slots(self, time_str):
+        """Slots for one service and day, computed as time_str if not cached"""
+        service = mock.Mock(id=1)
+        day = date(2025, 9, 1)
+        start = timezone.make_aware(datetime.combine(day, time(9)))
+        with mock.patch('core.slot_cache.find_available_slots',
+                        return_value=[(time_str, start, start)]):
+            slots = cached_available_slots(service, {day: ('v1',)})
+        return [time_str for time_str, _, _ in slots]
+
+    def test_slots_are_recomputed(self):
+        self.assertEqual(self.cached_slots('09:00'), ['09:00'])
+        self.assertEqual(self.cached_slots('10:00'), ['09:00'])
+
+        clear_slot_cache()
+        self.assertEqual(self.cached_slots('10:00'), ['10:00'])
+
+    def test_other_aliases_are_kept(self):
+        caches['ratelimit'].set('window', 3)
+        caches['default'].set('counter', 5)
+
+        clear_slot_cache()
+        clear_slot_cache()
+        self.assertEqual(caches['ratelimit'].get('window'), 3)
+        self.assertEqual(caches['default'].get('counter'), 5)
+
+
+def make_user(username, role, **names):
+    """A user with a profile of the given role"""
+    user = User.objects.create(username=username, **names)
+    return UserProfile.objects.create(user=user, role=role)
+
+
+def make_pet(owner, name, **fields):
+    """A verified medium pet of owner, a UserProfile"""
+    fields = {
+        'breed': 'Mixed', 'date_of_birth': date(2020, 1, 1),
+        'profile_status': 'verified', 'size': 'medium', **fields
+    }
+    return PetProfile.objects.create(user=owner.user, name=name, **fields)
+
+
+def at(days, hour, minute=0):
+    """Aware datetime hour:minute, days from today"""
+    day = timezone.localdate() + timedelta(days=days)
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+class AppointmentFixture:
+    """A client, three employees and a one hour service"""
+
+    def setUp(self):
+        clear_pending_counts()
+        self.client_profile = make_user('client', 'client')
+        self.employees = [
+            make_user(f'employee_{i}', 'employee') for i in range(3)
+        ]
+        self.service = Service.objects.create(
+            name='Full Groom', duration=timedelta(hours=1),
+            allowed_start_times='09:00,10:00,11:00,14:00'
+        )
+        self.pets = 0
+
+    def book(self, start, status='pending', employee=None):
+        """An appointment for a new pet, in its employee's calendar if any"""
+        self.pets += 1
+        appointment = Appointment.objects.create(
+            pet_profile=make_pet(self.client_profile, f'Pet {self.pets}'),
+            service=self.service,
+            appointment_time=start,
+            employee=employee,
+            status=status
+        )
+        if employee:
+            EmployeeCalendar.objects.create(
+                user_profile=employee, appointment=appointment,
+                scheduled_time=start, available_time=False
+            )
+        return appointment
+
+
+class ManagerAjaxFixture(AppointmentFixture):
+    """AppointmentFixture with a logged in manager"""
+
+    def setUp(self):
+        super().setUp()
+        manager = make_user('manager', 'manager')
+        self.client.force_login(manager.user)
+        # The views log what they change
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def post_json(self, name, data):
+        return self.client.post(
+            reverse(name), json.dumps(data), content_type='application/json'
+        )
+
+
+class BulkDecisionTests(ManagerAjaxFixture, TestCase):
+    """Approving, rejecting and reassigning appointments in one request"""
+
+    def post(self, decisions):
+        return self.post_json('bulk_appointments_ajax', {'decisions': decisions})
+
+    def test_mixed_decisions(self):
+        first, second, third = self.employees
+        approve = self.book(at(1, 10))
+        reject = self.book(at(1, 10))
+        reassign = self.book(at(1, 14), 'approved', second)
+
+        response = self.post([
+            {'appointment_id': approve.id, 'decision': 'approve',
+             'employee_id': first.id},
+            {'appointment_id': reject.id, 'decision': 'reject'},
+            {'appointment_id': reassign.id, 'decision': 'reassign',
+             'employee_id': third.id},
+            {'appointment_id': approve.id, 'decision': 'approve',
+             'employee_id': second.id},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['applied'], data['failed']), (3, 1))
+        self.assertEqual(
+            [result['success'] for result in data['results']],
+            [True, True, True, False]
+        )
+
+        for appointment, status, employee in (
+            (approve, 'approved', first),
+            (reject, 'rejected', None),
+            (reassign, 'approved', third),
+        ):
+            appointment.refresh_from_db()
+            self.assertEqual(appointment.status, status)
+            self.assertEqual(appointment.employee, employee)
+
+        self.assertEqual(
+            set(EmployeeCalendar.objects.values_list(
+                'appointment_id', 'user_profile_id'
+            )),
+            {(approve.id, first.id), (reassign.id, third.id)}
+        )
+
+    def test_overlapping_reassignment_is_refused(self):
+        first, second, _ = self.employees
+        self.book(at(1, 10), 'approved', first)
+        moving = self.book(at(1, 10, 30), 'approved', second)
+
+        response = self.post([
+            {'appointment_id': moving.id, 'decision': 'reassign',
+             'employee_id': first.id},
+        ])
+
+        result = response.json()['results'][0]
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'Employee is not available at this time')
+        moving.refresh_from_db()
+        self.assertEqual(moving.employee, second)
+        self.assertEqual(
+            EmployeeCalendar.objects.get(appointment=moving).user_profile, second
+        )
+
+    def test_chained_reassignments(self):
+        first, second, third = self.employees
+        moving_on = self.book(at(1, 10), 'approved', second)
+        moving_in = self.book(at(1, 10), 'approved', first)
+        approved = self.book(at(1, 10))
+
+        # moving_in takes second's slot once moving_on has left it, and
+        # the approval takes the slot moving_in leaves
+        response = self.post([
+            {'appointment_id': moving_on.id, 'decision': 'reassign',
+             'employee_id': third.id},
+            {'appointment_id': moving_in.id, 'decision': 'reassign',
+             'employee_id': second.id},
+            {'appointment_id': approved.id, 'decision': 'approve',
+             'employee_id': first.id},
+        ])
+
+        self.assertEqual(response.json()['applied'], 3)
+        self.assertEqual(
+            dict(Appointment.objects.values_list('id', 'employee_id')),
+            {moving_on.id: third.id, moving_in.id: second.id,
+             approved.id: first.id}
+        )
+
+    def test_decision_limit(self):
+        appointment = self.book(at(1, 10))
+        decisions = [
+            {'appointment_id': appointment.id, 'decision': 'reject'}
+        ] * (MAX_BULK_DECISIONS + 1)
+
+        response = self.post(decisions)
+
+        self.assertEqual(response.status_code, 400)
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.status, 'pending')
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True)
+class RequestMetricsTests(TestCase):
+    """Request metrics in sync and async middleware chains"""
+
+    def logged(self, middleware, request):
+        """Serve request through middleware, returning the logged metrics"""
+        with self.assertLogs('core.requests', 'INFO') as logs:
+            if iscoroutinefunction(middleware):
+                response = async_to_sync(middleware)(request)
+            else:
+                response = middleware(request)
+        self.assertEqual(response['X-Request-ID'], 'abc')
+        return logs.records[0].data
+
+    def test_sync_view(self):
+        def view(request):
+            User.objects.count()
+            User.objects.exists()
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        self.assertFalse(iscoroutinefunction(middleware))
+        data = self.logged(
+            middleware, RequestFactory().get('/', HTTP_X_REQUEST_ID='abc')
+        )
+        self.assertEqual(data['queries'], 2)
+
+    def test_async_view_stays_async(self):
+        async def view(request):
+            await User.objects.acount()
+            await sync_to_async(User.objects.exists)()
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        data = self.logged(
+            middleware, RequestFactory().get('/', HTTP_X_REQUEST_ID='abc')
+        )
+        self.assertEqual(data['queries'], 2)
+
+
+def per_slot_available(service, day):
+    """
+    Start times available on a day, found the way get_available_slots did
+    before find_available_slots: two queries per employee per start time
+    """
+    slots = []
+    employees = UserProfile.objects.filter(role='employee')
+    for time_str in service.get_allowed_times():
+        try:
+            start = timezone.make_aware(
+                datetime.strptime(f"{day} {time_str}", "%Y-%m-%d %H:%M")
+            )
+        except ValueError:
+            continue
+        end = start + service.duration
+
+        for employee in employees:
+            conflict = EmployeeCalendar.objects.filter(
+                user_profile=employee,
+                scheduled_time__lt=end,
+                scheduled_time__gte=start
+            ).exists()
+            time_off = TimeOffRequest.objects.filter(
+                user_profile=employee,
+                status='approved',
+                start_time__lt=end,
+                end_time__gt=start
+            ).exists()
+            if not conflict and not time_off:
+                slots.append(time_str)
+                break
+    return slots
+
+
+class AvailableSlotsTests(AppointmentFixture, TestCase):
+    """find_available_slots against the per-slot queries it replaced"""
+
+    def setUp(self):
+        super().setUp()
+        self.service.allowed_start_times = (
+            '09:00, 09:30,10:00,11:00,14:00,16:30,25:00,noon'
+        )
+        self.service.save()
+        first, second, third = self.employees
+
+        # Day 1: adjacent bookings for first, overlapping ones for second
+        # and third off all morning in two overlapping requests
+        for start in (at(1, 9), at(1, 10), at(1, 11)):
+            self.book(start, 'approved', first)
+        for start in (at(1, 9, 30), at(1, 9, 45), at(1, 14)):
+            self.book(start, 'approved', second)
+        self.time_off(third, at(1, 8), at(1, 10, 30))
+        self.time_off(third, at(1, 10), at(1, 12))
+
+        # Second is off from the evening of day 2 to mid-morning of day 4
+        # and first from the afternoon of day 3, so only third is free
+        # then, and busy on part of it
+        self.time_off(second, at(2, 18), at(4, 10))
+        self.time_off(first, at(3, 13), at(5, 0))
+        self.book(at(3, 14), 'approved', third)
+        self.book(at(3, 16, 45), 'approved', third)
+
+        # Ignored: unapproved time off and calendar entries of nobody
+        self.time_off(third, at(3, 9), at(3, 18), status='pending')
+        self.time_off(third, at(3, 9), at(3, 18), status='rejected')
+        entry = EmployeeCalendar.objects.first()
+        EmployeeCalendar.objects.create(
+            user_profile=None, appointment=entry.appointment,
+            scheduled_time=at(4, 11), available_time=False
+        )
+
+        self.days = [timezone.localdate() + timedelta(days=n) for n in range(1, 6)]
+
+    def time_off(self, employee, start, end, status='approved'):
+        TimeOffRequest.objects.create(
+            user_profile=employee, start_time=start, end_time=end,
+            status=status, approved=status == 'approved'
+        )
+
+    def expected(self):
+        return [
+            (day, time_str)
+            for day in self.days
+            for time_str in per_slot_available(self.service, day)
+        ]
+
+    def test_same_slots_as_per_slot_queries(self):
+        slots = find_available_slots(self.service, self.days[0], self.days[-1])
+        self.assertEqual(
+            [(start.date(), time_str) for time_str, start, _ in slots],
+            self.expected()
+        )
+        # The fixture rules out slots on days 1 and 3
+        self.assertLess(len(slots), 6 * len(self.days))
+
+    def test_same_slots_async(self):
+        slots = async_to_sync(afind_available_slots)(
+            self.service, self.days[0], self.days[-1]
+        )
+        self.assertEqual(
+            [(start.date(), time_str) for time_str, start, _ in slots],
+            self.expected()
+        )
+
+    def test_single_days(self):
+        for day in self.days:
+            with self.subTest(day=day):
+                slots = find_available_slots(self.service, day, day)
+                self.assertEqual(
+                    [time_str for time_str, _, _ in slots],
+                    per_slot_available(self.service, day)
+                )
+
+
+class AssignEmployeeTests(ManagerAjaxFixture, TestCase):
+    """Approving and reassigning onto employees who may be busy"""
+
+    def setUp(self):
+        super().setUp()
+        self.busy, self.other, _ = self.employees
+        self.book(at(1, 10), 'approved', self.busy)
+
+    def test_approve_onto_free_employee(self):
+        pending = self.book(at(1, 11))
+        response = self.post_json('approve_appointment_ajax', {
+            'appointment_id': pending.id, 'employee_id': self.busy.id
+        })
+
+        self.assertTrue(response.json()['success'])
+        pending.refresh_from_db()
+        self.assertEqual((pending.status, pending.employee), ('approved', self.busy))
+        self.assertEqual(
+            EmployeeCalendar.objects.get(appointment=pending).user_profile,
+            self.busy
+        )
+
+    def test_approve_onto_busy_employee_is_refused(self):
+        pending = self.book(at(1, 10, 30))
+        response = self.post_json('approve_appointment_ajax', {
+            'appointment_id': pending.id, 'employee_id': self.busy.id
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()['error'], 'Employee is not available at this time'
+        )
+        pending.refresh_from_db()
+        self.assertEqual((pending.status, pending.employee), ('pending', None))
+        self.assertFalse(
+            EmployeeCalendar.objects.filter(appointment=pending).exists()
+        )
+
+    def test_reassign_onto_busy_employee_is_refused(self):
+        moving = self.book(at(1, 9, 30), 'approved', self.other)
+        response = self.post_json('reassign_appointment_ajax', {
+            'appointment_id': moving.id, 'employee_id': self.busy.id
+        })
+
+        self.assertEqual(response.status_code, 400)
+        moving.refresh_from_db()
+        self.assertEqual(moving.employee, self.other)
+        self.assertEqual(
+            list(EmployeeCalendar.objects.filter(
+                appointment=moving
+            ).values_list('user_profile_id', flat=True)),
+            [self.other.id]
+        )
+
+    def test_database_constraint_violation(self):
+        """The PostgreSQL path, where the exclusion constraint does the check"""
+        moving = self.book(at(1, 10), 'approved', self.other)
+        violation = IntegrityError(
+            f'conflicting key value violates exclusion constraint '
+            f'"{OVERLAP_CONSTRAINT}"'
+        )
+
+        with mock.patch('core.assignments.overlap_enforced_by_database',
+                        return_value=True), \
+                mock.patch.object(Appointment, 'save', side_effect=violation):
+            with transaction.atomic(), self.assertRaises(EmployeeUnavailable):
+                assign_employee(moving, self.busy)
+
+            # Any other integrity error is not about availability
+            Appointment.save.side_effect = IntegrityError('other')
+            with transaction.atomic(), self.assertRaises(IntegrityError):
+                assign_employee(moving, self.busy)
+
+        self.assertEqual(
+            list(EmployeeCalendar.objects.filter(
+                appointment=moving
+            ).values_list('user_profile_id', flat=True)),
+            [self.other.id]
+        )
+
+
+class SlotCacheTests(AppointmentFixture, TestCase):
+    """Slots cached per service and date"""
+
+    def setUp(self):
+        super().setUp()
+        caches['slots'].clear()
+        self.days = [timezone.localdate() + timedelta(days=n) for n in range(1, 31)]
+
+    def cached(self, first, last):
+        """
+        Cached slots from day first to day last (1 based) and the ranges
+        that had to be worked out
+        """
+        with mock.patch('core.slot_cache.find_available_slots',
+                        wraps=find_available_slots) as computed:
+            slots = cached_available_slots(
+                self.service,
+                slots_version(self.service, self.days[first - 1], self.days[last - 1])
+            )
+        ranges = [
+            (self.days.index(call.args[1]) + 1, self.days.index(call.args[2]) + 1)
+            for call in computed.call_args_list
+        ]
+        self.assertEqual(slots, find_available_slots(
+            self.service, self.days[first - 1], self.days[last - 1]
+        ))
+        return slots, ranges
+
+    def test_overlapping_ranges_share_dates(self):
+        self.assertEqual(self.cached(1, 7)[1], [(1, 7)])
+        self.assertEqual(self.cached(1, 30)[1], [(8, 30)])
+        self.assertEqual(self.cached(10, 16)[1], [])
+
+    def test_changed_date_is_recomputed(self):
+        self.cached(1, 7)
+        for employee in self.employees:
+            self.book(at(3, 10), 'approved', employee)
+
+        slots, ranges = self.cached(1, 7)
+        self.assertEqual(ranges, [(3, 3)])
+        self.assertNotIn(
+            at(3, 10), [start for _, start, _ in slots]
+        )
+
+    def test_time_off_over_several_dates(self):
+        self.cached(1, 7)
+        for employee in self.employees:
+            TimeOffRequest.objects.create(
+                user_profile=employee, start_time=at(2, 12),
+                end_time=at(4, 10), status='approved', approved=True
+            )
+
+        slots, ranges = self.cached(1, 7)
+        self.assertEqual(ranges, [(2, 4)])
+        self.assertEqual(
+            [start for _, start, _ in slots if start.date() == self.days[2]],
+            []
+        )
+
+    def test_async(self):
+        self.cached(1, 7)
+        versions = slots_version(self.service, self.days[0], self.days[13])
+        with mock.patch('core.slot_cache.afind_available_slots',
+                        wraps=afind_available_slots) as computed:
+            slots = async_to_sync(acached_available_slots)(self.service, versions)
+
+        self.assertEqual(
+            [call.args[1:] for call in computed.call_args_list],
+            [(self.days[7], self.days[13])]
+        )
+        self.assertEqual(
+            slots, find_available_slots(self.service, self.days[0], self.days[13])
+        )
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+class PetApprovalTests(TestCase):
+    """Approving and rejecting pending pets from the pet approval page"""
+
+    def setUp(self):
+        clear_pending_counts()
+        manager = make_user('manager', 'manager')
+        self.client.force_login(manager.user)
+        owner = make_user('owner', 'client')
+        self.approve, self.reject, self.unsized = (
+            make_pet(owner, name, profile_status='pending', size=None)
+            for name in ('Approve', 'Reject', 'Unsized')
+        )
+        # Reviewed by someone else after the page was loaded
+        self.reviewed = make_pet(owner, 'Reviewed', size='small')
+
+    def post(self, decisions):
+        """Post {pet: (decision, size)} from the approval page"""
+        data = {}
+        for pet, (decision, size) in decisions.items():
+            data[f'{pet.id}-decision'] = decision
+            data[f'{pet.id}-size'] = size
+        return self.client.post(reverse('approve_pets'), data)
+
+    def test_decisions(self):
+        self.assertEqual(get_pending_counts()['pets'], 3)
+
+        # The session, user and profile, then a savepoint around one
+        # UPDATE for the approval and one for the rejection
+        with self.assertNumQueries(7):
+            response = self.post({
+                self.approve: ('approve', 'large'),
+                self.reject: ('reject', 'small'),
+                self.unsized: ('approve', ''),
+                self.reviewed: ('reject', 'medium'),
+            })
+        self.assertRedirects(response, reverse('approve_pets'),
+                             fetch_redirect_response=False)
+
+        for pet, status, size in (
+            (self.approve, 'verified', 'large'),
+            (self.reject, 'rejected', None),
+            (self.unsized, 'pending', None),
+            (self.reviewed, 'verified', 'small'),
+        ):
+            pet.refresh_from_db()
+            self.assertEqual((pet.profile_status, pet.size), (status, size))
+        self.assertIsNotNone(self.approve.verified_at)
+        # update() sends no signals, so apply_pet_decisions drops the counter
+        self.assertEqual(get_pending_counts()['pets'], 1)
+
+    def test_one_update_per_size(self):
+        owner = self.approve.user.userprofile
+        pets = [
+            make_pet(owner, f'Pending {i}', profile_status='pending', size=None)
+            for i in range(4)
+        ]
+
+        with self.assertNumQueries(7):
+            self.post({
+                pet: ('approve', 'small' if i % 2 else 'large')
+                for i, pet in enumerate(pets)
+            })
+
+        self.assertEqual(
+            dict(PetProfile.objects.filter(
+                id__in=[pet.id for pet in pets]
+            ).values_list('name', 'size')),
+            {'Pending 0': 'large', 'Pending 1': 'small',
+             'Pending 2': 'large', 'Pending 3': 'small'}
+        )
+
+
+class DirectoryFixture:
+    """A manager and three clients, and the pages of a directory view"""
+
+    def setUp(self):
+        self.manager = make_user('manager', 'manager')
+        self.owners = [make_user(f'owner_{i}', 'client') for i in range(3)]
+
+    def get(self, directory, query=''):
+        request = RequestFactory().get('/', QueryDict(query))
+        request.user = self.manager.user
+        return directory(request)
+
+    def walk(self, directory, rows_key):
+        """Every row of every page, following the next page links"""
+        rows, query = [], ''
+        while query is not None:
+            context = self.get(directory, query)
+            rows.extend(context[rows_key])
+            query = context['next_page_query'] or None
+        return rows
+
+
+class UserListingTests(DirectoryFixture, TestCase):
+    """Keyset pages, role counts and pet counts of the user listing"""
+
+    def setUp(self):
+        super().setUp()
+        make_user('pending_1', 'pending')
+        make_user('employee_1', 'employee', first_name='Owen')
+        for i, owner in enumerate(self.owners):
+            for n in range(i + 1):
+                make_pet(owner, f'Pet {n}')
+        make_pet(self.owners[0], 'Waiting', profile_status='pending')
+
+    def test_pages(self):
+        with mock.patch('core.views.manager_views.USERS_PER_PAGE', 2):
+            users = self.walk(user_directory, 'users_page')
+
+        self.assertEqual(
+            [profile.user.username for profile in users],
+            ['employee_1', 'owner_0', 'owner_1', 'owner_2', 'pending_1']
+        )
+        self.assertEqual(
+            {profile.user.username: profile.pet_count for profile in users},
+            {'employee_1': 0, 'owner_0': 2, 'owner_1': 2, 'owner_2': 3,
+             'pending_1': 0}
+        )
+
+    def test_role_counts_follow_the_search(self):
+        context = self.get(user_directory, 'q=ow&role=client')
+        self.assertEqual(
+            {value: count for value, _, count in context['role_counts']},
+            {'client': 3, 'employee': 1, 'manager': 0, 'pending': 0}
+        )
+        self.assertEqual(context['user_total'], 4)
+        self.assertEqual(len(context['users_page']), 3)
+
+    def test_malformed_cursor_starts_over(self):
+        with mock.patch('core.views.manager_views.USERS_PER_PAGE', 2):
+            first_page = self.get(user_directory)['users_page']
+            context = self.get(user_directory, 'after=owner_0&after=extra')
+        self.assertEqual(context['users_page'], first_page)
+
+
+class PetDirectoryTests(DirectoryFixture, TestCase):
+    """Keyset pages and annotations of the verified pet directory"""
+
+    def setUp(self):
+        super().setUp()
+        # Runs of equal names, so page boundaries fall inside a tie
+        for i, name in enumerate(['Rex'] * 7 + ['Ace'] * 3 + ['Max'] * 4):
+            make_pet(self.owners[i % 3], name)
+        make_pet(self.owners[0], 'Rex', profile_status='pending')
+
+    def test_pages_cover_tied_names_once(self):
+        with mock.patch('core.views.manager_views.PETS_PER_PAGE', 3):
+            pets = self.walk(pet_directory, 'pets_page')
+
+        expected = PetProfile.objects.filter(
+            profile_status='verified'
+        ).order_by('name', 'id')
+        self.assertEqual([pet.id for pet in pets], [pet.id for pet in expected])
+
+    def test_malformed_cursor_starts_over(self):
+        pets = PetProfile.objects.filter(profile_status='verified')
+        first_page, _ = keyset_page(pets, ['name', 'id'], [], 3)
+
+        for after in (['Rex', 'not a number'], ['Rex'], ['Rex', '1', '2']):
+            with self.subTest(after=after):
+                page, _ = keyset_page(pets, ['name', 'id'], after, 3)
+                self.assertEqual(page, first_page)
+
+        with mock.patch('core.views.manager_views.PETS_PER_PAGE', 3):
+            context = self.get(pet_directory, 'after=Rex&after=x')
+        self.assertEqual(context['pets_page'], first_page)
+
+    def test_annotations(self):
+        today = date.today()
+        pet = make_pet(
+            self.owners[0], 'Aged',
+            date_of_birth=today.replace(year=today.year - 4) + timedelta(days=1)
+        )
+        service = Service.objects.create(
+            name='Bath', duration=timedelta(hours=1), allowed_start_times='09:00'
+        )
+        for days in range(5):
+            Appointment.objects.create(
+                pet_profile=pet, service=service,
+                appointment_time=at(-days, 9), status='approved'
+            )
+
+        aged = self.get(pet_directory, 'q=Aged')['pets_page'][0]
+        self.assertEqual(aged.calculated_age, 3)
+        self.assertEqual(aged.appointment_count, 5)
+        self.assertEqual(
+            [appointment.appointment_time for appointment in aged.recent_appointments],
+            [at(0, 9), at(-1, 9), at(-2, 9)]
+        )
+
+
+class CalendarVersionTests(AppointmentFixture, TestCase):
+    """What changes the version behind the calendar events ETag"""
+
+    def setUp(self):
+        super().setUp()
+        self.employee = self.employees[0]
+        self.book(at(1, 10), 'approved', self.employee)
+
+    def version(self):
+        return calendar_version(Appointment.objects.all())
+
+    def test_renamed_employee_and_owner(self):
+        for user in (self.employee.user, self.client_profile.user):
+            with self.subTest(user=user.username):
+                before = self.version()
+                user.first_name = 'Renamed'
+                user.save()
+                self.assertNotEqual(self.version(), before)
+
+    def test_login_keeps_version(self):
+        before = self.version()
+        user = self.employee.user
+        user.last_login = timezone.now()
+        user.save(update_fields=['last_login'])
+        self.assertEqual(self.version(), before)
@@ -3,13 +3,13 @@ Dog Booking System
 Author: Kerem Haeger
 Created: August 2025
 """
+from django.conf import settings
 from django.urls import path
 from . import views
-from .views import fetch_available_slots
+from .views import api_views, async_api_views
 from .views.api_views import (
-     get_service_price, get_calendar_events, debug_appointments,
-     approve_appointment_ajax, reject_appointment_ajax,
-     get_available_employees, reassign_appointment_ajax
+     debug_appointments, approve_appointment_ajax, reject_appointment_ajax,
+     reassign_appointment_ajax, bulk_appointments_ajax
 )
 from .views.auth_views import register_view
 from .views.manager_views import (
@@ -20,6 +20,9 @@ from .views.manager_views import (
     delete_user
 )
 
+# The read-only AJAX endpoints have async versions for ASGI deployments
+ajax_views = async_api_views if settings.ASYNC_AJAX_VIEWS else api_views
+
 urlpatterns = [
      path(
           'redirect-by-role/',
@@ -47,7 +50,7 @@ urlpatterns = [
           ),
      path(
           'ajax/available-slots/',
-          fetch_available_slots,
+          ajax_views.fetch_available_slots,
           name='fetch_available_slots'
           ),
      path('employee/', views.employee_dashboard, name='employee_dashboard'),
@@ -99,16 +102,25 @@ urlpatterns = [
           views.delete_service,
           name='delete_service'
           ),
-     path('ajax/get-service-price/', get_service_price, name='get_service_price'),
-     path('ajax/calendar-events/', get_calendar_events, name='get_calendar_events'),
+     path('ajax/get-service-price/', ajax_views.get_service_price, name='get_service_price'),
+     path('ajax/calendar-events/', ajax_views.get_calendar_events, name='get_calendar_events'),
      path('ajax/debug-appointments/', debug_appointments, name='debug_appointments'),
      path('ajax/approve-appointment/', approve_appointment_ajax, name='approve_appointment_ajax'),
      path('ajax/reject-appointment/', reject_appointment_ajax, name='reject_appointment_ajax'),
-     path('ajax/get-available-employees/', get_available_employees, name='get_available_employees'),
+     path(
+          'ajax/get-available-employees/',
+          ajax_views.get_available_employees,
+          name='get_available_employees'
+          ),
      path(
           'ajax/reassign-appointment/',
           reassign_appointment_ajax,
           name='reassign_appointment_ajax'
           ),
+     path(
+          'ajax/bulk-appointments/',
+          bulk_appointments_ajax,
+          name='bulk_appointments_ajax'
+          ),
      path('register/', register_view, name='register'),
 ]
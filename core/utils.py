@@ -3,9 +3,10 @@ Dog Booking System
 Author: Kerem Haeger
 Created: August 2025
 """
-from datetime import datetime
-from django.utils.timezone import make_aware
-from .models import UserProfile, EmployeeCalendar, TimeOffRequest
+from datetime import timedelta
+from django.db.models import Max
+from .availability import find_available_slots
+from .models import Appointment, Service
 
 
 def appointments_overlap(
@@ -29,68 +30,29 @@ def get_overlapping_appointments(target_appointment):
     Get all approved appointments that overlap with the target appointment.
     Returns a queryset of overlapping appointments.
     """
-    from .models import Appointment  # Import here to avoid circular imports
-
     target_start = target_appointment.appointment_time
     target_end = target_appointment.get_end_time()
 
-    # Find all approved appointments that overlap with this time range
-    overlapping = Appointment.objects.filter(
+    # No appointment can last longer than the longest service, which lets
+    # the start time range below be served by the status/time index
+    longest = Service.objects.aggregate(
+        longest=Max('duration')
+    )['longest'] or timedelta(0)
+
+    return Appointment.objects.filter(
         status='approved',
-        employee__isnull=False
+        employee__isnull=False,
+        appointment_time__lt=target_end,
+        appointment_time__gt=target_start - longest,
+        end_time__gt=target_start
     ).exclude(id=target_appointment.id)
 
-    # Filter for actual overlaps - we need to check each one individually
-    # because database doesn't have the calculated end time
-    overlapping_appointments = []
-    for appt in overlapping:
-        appt_start = appt.appointment_time
-        appt_end = appt.get_end_time()
-
-        if appointments_overlap(target_start, target_end, appt_start, appt_end):
-            overlapping_appointments.append(appt)
-
-    return overlapping_appointments
-
 
 def get_available_slots(service, date_obj):
     """
     Get available time slots for a specific service on a given date.
     """
-    service_length = service.duration
-    slots = []
-
-    # Get predefined allowed start times from the service model
-    allowed_times = service.get_allowed_times()  # ["09:00", "11:30", "14:00"]
-    employees = UserProfile.objects.filter(role='employee')
-
-    for time_str in allowed_times:
-        try:
-            datetime_str = f"{date_obj} {time_str}"
-            start_time = make_aware(
-                datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-            )
-            end_time = start_time + service_length
-        except ValueError:
-            continue  # Skip malformed times
-
-        # Check if at least one employee is free
-        for employee in employees:
-            conflict = EmployeeCalendar.objects.filter(
-                user_profile=employee,
-                scheduled_time__lt=end_time,
-                scheduled_time__gte=start_time
-            ).exists()
-
-            time_off = TimeOffRequest.objects.filter(
-                user_profile=employee,
-                status='approved',
-                start_time__lt=end_time,
-                end_time__gt=start_time
-            ).exists()
-
-            if not conflict and not time_off:
-                slots.append(time_str)  # only append once (per time)
-                break  # no need to check other employees
-
-    return slots
+    return [
+        time_str
+        for time_str, _, _ in find_available_slots(service, date_obj, date_obj)
+    ]
@@ -0,0 +1,138 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import hashlib
+from datetime import datetime, timedelta
+from functools import partial
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.utils.timezone import localdate, make_aware
+from .async_queries import run_queries
+from .availability import parse_start_times
+from .models import UserProfile, EmployeeCalendar, TimeOffRequest
+
+
+def make_etag(*parts):
+    """Build an entity tag from any number of version components"""
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def calendar_version(appointments):
+    """
+    Version of the calendar events built from an appointment queryset.
+    The row count catches rows leaving the range (deleted, rejected,
+    moved) and the latest update times catch everything else, including
+    renamed pets, changed services and renamed employees and owners
+    (recorded on their profiles, see signals.touch_renamed_profile).
+    """
+    stats = appointments.aggregate(
+        count=Count('id'),
+        updated=Max('updated_at'),
+        pets=Max('pet_profile__updated_at'),
+        services=Max('service__updated_at'),
+        employees=Max('employee__updated_at'),
+        owners=Max('pet_profile__user__userprofile__updated_at'),
+    )
+    return tuple(stats.values())
+
+
+def slot_windows(service, start_date, end_date):
+    """
+    The time each date's slots can cover, from its first start time to
+    the end of its last slot. Returns {date: (start, end)} for every date
+    from start_date to end_date, or {} if the service has no start times.
+    """
+    times = [start for _, start in parse_start_times(service.allowed_start_times)]
+    if not times:
+        return {}
+
+    windows = {}
+    day = start_date
+    while day <= end_date:
+        windows[day] = (
+            make_aware(datetime.combine(day, min(times))),
+            make_aware(datetime.combine(day, max(times))) + service.duration
+        )
+        day += timedelta(days=1)
+    return windows
+
+
+def slots_version_parts(windows):
+    """
+    Callables returning what the slot versions of some dates are built
+    from: the employee list, calendar entries counted per date and the
+    approved time off within the window the dates' slots cover.
+    """
+    window_start = min(start for start, _ in windows.values())
+    window_end = max(end for _, end in windows.values())
+
+    employees = UserProfile.objects.filter(role='employee')
+    bookings = EmployeeCalendar.objects.filter(
+        scheduled_time__gte=window_start,
+        scheduled_time__lt=window_end
+    ).annotate(day=TruncDate('scheduled_time')).values_list('day').annotate(
+        count=Count('id'), updated=Max('updated_at')
+    ).order_by()
+    time_off = TimeOffRequest.objects.filter(
+        status='approved',
+        start_time__lt=window_end,
+        end_time__gt=window_start
+    ).values_list('id', 'updated_at', 'start_time', 'end_time')
+
+    return [
+        lambda: tuple(employees.aggregate(
+            count=Count('id'), updated=Max('updated_at')
+        ).values()),
+        partial(list, bookings),
+        partial(list, time_off),
+    ]
+
+
+def date_versions(service, windows, employees, bookings, time_off):
+    """
+    Version of each date's slots. The row count of a date's calendar
+    entries catches removed bookings and the latest update time catches
+    the rest, taken for every date its slots reach into. Time off is
+    identified row by row, as it often spans several dates.
+    """
+    booked = {day: (count, updated) for day, count, updated in bookings}
+    versions = {}
+    for day, (start, end) in windows.items():
+        last_day = localdate(end - timedelta(microseconds=1))
+        versions[day] = (
+            service.updated_at,
+            employees,
+            tuple(
+                booked.get(day + timedelta(days=offset))
+                for offset in range((last_day - day).days + 1)
+            ),
+            tuple(
+                (time_off_id, updated)
+                for time_off_id, updated, off_start, off_end in time_off
+                if off_start < end and off_end > start
+            ),
+        )
+    return versions
+
+
+def slots_version(service, start_date, end_date):
+    """
+    Version of a service's slots on every date between two dates.
+    Returns {date: version}, {} if the service has no start times.
+    """
+    windows = slot_windows(service, start_date, end_date)
+    if not windows:
+        return {}
+    parts = [part() for part in slots_version_parts(windows)]
+    return date_versions(service, windows, *parts)
+
+
+async def aslots_version(service, start_date, end_date):
+    """Async version of slots_version"""
+    windows = slot_windows(service, start_date, end_date)
+    if not windows:
+        return {}
+    parts = await run_queries(*slots_version_parts(windows))
+    return date_versions(service, windows, *parts)
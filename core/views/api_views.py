@@ -3,64 +3,124 @@ Dog Booking System
 Author: Kerem Haeger
 Created: August 2025
 """
-from django.http import JsonResponse
-from django.views.decorators.http import require_GET, require_http_methods
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import (
+    condition, require_GET, require_http_methods
+)
 from django.contrib.auth.decorators import user_passes_test
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
+import logging
+import re
 
 from ..models import (
     Service, PetProfile, ServicePrice, Appointment, UserProfile, EmployeeCalendar
 )
-from ..utils import get_available_slots
+from ..assignments import EmployeeUnavailable, apply_decisions, assign_employee
+from ..instrumentation import span
+from ..slot_cache import cached_available_slots
+from ..versioning import calendar_version, make_etag, slots_version
 from .roles import is_manager
 
+logger = logging.getLogger(__name__)
+
+# Largest batch accepted by bulk_appointments_ajax
+MAX_BULK_DECISIONS = 500
+
+
+def parse_slot_request(request):
+    """
+    Get the service and date range of a slot request.
+    Raises KeyError, ValueError or Service.DoesNotExist if they are invalid.
+    """
+    service_id = request.GET['service_id']
+    start_str = request.GET['start']
+    end_str = request.GET['end']
+
+    service = Service.objects.get(id=service_id)
+    start_date = datetime.strptime(start_str[:10], "%Y-%m-%d").date()
+    end_date = datetime.strptime(end_str[:10], "%Y-%m-%d").date()
+    return service, start_date, end_date
+
+
+def available_slots_version(request, service, start_date, end_date):
+    """
+    slots_version of a slot request. It is read once, for the ETag, and
+    reused to key the slot cache, so the cached body always belongs to
+    the version the ETag describes.
+    """
+    key = (service.id, start_date, end_date)
+    cached_key, version = getattr(request, '_slots_version', (None, None))
+    if cached_key != key:
+        version = slots_version(service, start_date, end_date)
+        request._slots_version = (key, version)
+    return version
+
+
+def available_slots_etag(request):
+    """ETag for a slot request, or None if the request is invalid"""
+    try:
+        service, start_date, end_date = parse_slot_request(request)
+    except (KeyError, ValueError, Service.DoesNotExist):
+        return None
+
+    # Past dates are never shown
+    now = timezone.now()
+    start_date = max(start_date, now.date())
+    if start_date > end_date:
+        return make_etag('empty')
+
+    # Today's slots disappear as they start, so a range including today
+    # is only current for the minute it was generated in
+    minute = (now.replace(second=0, microsecond=0)
+              if start_date == now.date() else None)
+
+    return make_etag(
+        service.id, start_date, end_date, minute,
+        available_slots_version(request, service, start_date, end_date)
+    )
+
 
 @require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=available_slots_etag)
 def fetch_available_slots(request):
     """AJAX endpoint to fetch available appointment slots for a service"""
-    service_id = request.GET.get('service_id')
-    start_str = request.GET.get('start')
-    end_str = request.GET.get('end')
-
-    if not service_id or not start_str or not end_str:
+    if not all(request.GET.get(key) for key in ('service_id', 'start', 'end')):
         return JsonResponse({'error': 'Missing parameters'}, status=400)
 
     try:
-        service = Service.objects.get(id=service_id)
-        start_date = datetime.strptime(start_str[:10], "%Y-%m-%d").date()
-        end_date = datetime.strptime(end_str[:10], "%Y-%m-%d").date()
+        service, start_date, end_date = parse_slot_request(request)
     except (Service.DoesNotExist, ValueError):
         return JsonResponse({'error': 'Invalid parameters'}, status=400)
 
-    all_slots = []
     today = timezone.now().date()
     current_time = timezone.now()
 
-    date_range = (end_date - start_date).days + 1
-    for date in (start_date + timedelta(n) for n in range(date_range)):
-        # Only process dates that are today or in the future
-        if date < today:
-            continue
-
-        time_strings = get_available_slots(service, date)
-        for time_str in time_strings:
-            start_dt = timezone.make_aware(
-                datetime.strptime(f"{date} {time_str}", "%Y-%m-%d %H:%M")
+    # Past dates are skipped and the rest computed in a single pass
+    start_date = max(start_date, today)
+    slots = []
+    if start_date <= end_date:
+        with span('available_slots'):
+            slots = cached_available_slots(
+                service,
+                available_slots_version(request, service, start_date, end_date)
             )
 
-            # If it's today, only show slots that are in the future
-            if date == today and start_dt <= current_time:
-                continue
-
-            end_dt = start_dt + service.duration
-            all_slots.append({
-                "title": "Available",
-                "start": start_dt.isoformat(),
-                "end": end_dt.isoformat()
-            })
+    # If it's today, only show slots that are in the future
+    all_slots = [
+        {
+            "title": "Available",
+            "start": start_dt.isoformat(),
+            "end": end_dt.isoformat()
+        }
+        for _, start_dt, end_dt in slots
+        if start_dt > current_time
+    ]
 
     return JsonResponse(all_slots, safe=False)
 
@@ -85,128 +145,181 @@ def get_service_price(request):
                             status=404)
 
 
+def parse_calendar_datetime(value):
+    """Parse a FullCalendar range boundary as a UTC datetime"""
+    # Handle URL decoding issue where + becomes space
+    # First restore + signs in timezone offsets
+    if ' ' in value and 'T' in value:
+        value = value.replace(' ', '+')
+
+    # Remove timezone info (e.g., +01:00, -05:00, Z)
+    value = re.sub(r'[+-]\d{2}:\d{2}$|Z$', '', value)
+
+    # Parse the cleaned datetime string and make it timezone aware (assume UTC)
+    return timezone.make_aware(datetime.fromisoformat(value), timezone.utc)
+
+
+def calendar_appointments(start_date, end_date, employee_id):
+    """Appointments shown on the calendar for a range and employee filter"""
+    # Base query for appointments in the date range - exclude rejected appointments
+    appointments = Appointment.objects.filter(
+        appointment_time__gte=start_date,
+        appointment_time__lte=end_date
+    ).exclude(
+        status__in=['rejected', 'canceled']  # Don't show rejected/canceled on calendar
+    )
+
+    # Filter by employee if specified
+    if employee_id and employee_id != 'all':
+        try:
+            appointments = appointments.filter(employee_id=int(employee_id))
+        except (ValueError, TypeError):
+            pass
+
+    return appointments
+
+
+def calendar_events_etag(request):
+    """ETag for a calendar events request, or None if the request is invalid"""
+    try:
+        start_date = parse_calendar_datetime(request.GET['start'])
+        end_date = parse_calendar_datetime(request.GET['end'])
+    except (KeyError, ValueError, OverflowError):
+        return None
+    employee_id = request.GET.get('employee_id')
+
+    # Events flip to "past" as they start, so a range including now is
+    # only current for the minute it was generated in
+    now = timezone.now()
+    minute = (now.replace(second=0, microsecond=0)
+              if start_date <= now <= end_date else None)
+
+    appointments = calendar_appointments(start_date, end_date, employee_id)
+    return make_etag(
+        start_date, end_date, employee_id, minute,
+        calendar_version(appointments)
+    )
+
+
 @require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=calendar_events_etag)
 def get_calendar_events(request):
     """AJAX endpoint to fetch calendar events for FullCalendar"""
     start_str = request.GET.get('start')
     end_str = request.GET.get('end')
     employee_id = request.GET.get('employee_id')
 
-    # Debug logging
-    print(f"DEBUG: Received start={start_str}, end={end_str}")
+    logger.debug("Calendar events requested: start=%s, end=%s",
+                 start_str, end_str)
 
     if not start_str or not end_str:
         return JsonResponse({'error': 'Missing start/end parameters'},
                             status=400)
 
     try:
-        import re
-        # Handle URL decoding issue where + becomes space
-        # First restore + signs in timezone offsets
-        if ' ' in start_str and 'T' in start_str:
-            start_fixed = start_str.replace(' ', '+')
-        else:
-            start_fixed = start_str
-
-        if ' ' in end_str and 'T' in end_str:
-            end_fixed = end_str.replace(' ', '+')
-        else:
-            end_fixed = end_str
-
-        print(f"DEBUG: Fixed start={start_fixed}, end={end_fixed}")
-
-        # Remove timezone info (e.g., +01:00, -05:00, Z)
-        start_clean = re.sub(r'[+-]\d{2}:\d{2}$|Z$', '', start_fixed)
-        end_clean = re.sub(r'[+-]\d{2}:\d{2}$|Z$', '', end_fixed)
-
-        print(f"DEBUG: Cleaned start={start_clean}, end={end_clean}")
-
-        # Parse the cleaned datetime strings
-        start_date = datetime.fromisoformat(start_clean)
-        end_date = datetime.fromisoformat(end_clean)
-
-        print(f"DEBUG: Parsed start={start_date}, end={end_date}")
-
-        # Make timezone aware (assume UTC)
-        start_date = timezone.make_aware(start_date, timezone.utc)
-        end_date = timezone.make_aware(end_date, timezone.utc)
-
-        print(f"DEBUG: Timezone aware start={start_date}, end={end_date}")
-
+        start_date = parse_calendar_datetime(start_str)
+        end_date = parse_calendar_datetime(end_str)
     except Exception as e:
-        print(f"DEBUG: Error parsing dates: {e}")
+        logger.debug("Invalid calendar range %r - %r: %s",
+                     start_str, end_str, e)
         return JsonResponse({
             'error': f'Invalid date format: {str(e)}',
             'start_received': start_str,
             'end_received': end_str
         }, status=400)
 
-    # Base query for appointments in the date range - exclude rejected appointments
-    appointments = Appointment.objects.filter(
-        appointment_time__gte=start_date,
-        appointment_time__lte=end_date
-    ).exclude(
-        status__in=['rejected', 'canceled']  # Don't show rejected/canceled on calendar
-    ).select_related('pet_profile__user', 'service', 'employee__user')
+    appointments = calendar_appointments(start_date, end_date, employee_id)
 
-    print(f"DEBUG: Found {appointments.count()} appointments in date range")
+    # Stream the events array (FullCalendar expects this format)
+    return StreamingHttpResponse(
+        iter_calendar_events(appointments, timezone.now()),
+        content_type='application/json'
+    )
 
-    # Filter by employee if specified
-    if employee_id and employee_id != 'all':
-        try:
-            employee_id = int(employee_id)
-            appointments = appointments.filter(employee_id=employee_id)
-            print(f"DEBUG: Filtered to {appointments.count()} appointments "
-                  f"for employee {employee_id}")
-        except (ValueError, TypeError):
-            pass
 
-    events = []
-    now = timezone.now()
+# Only the columns the calendar needs are fetched
+CALENDAR_EVENT_COLUMNS = (
+    'id', 'appointment_time', 'end_time', 'status',
+    'pet_profile__name', 'service__name',
+    'employee__user_id', 'employee__user__first_name',
+    'employee__user__last_name', 'employee__user__username',
+    'pet_profile__user_id', 'pet_profile__user__first_name',
+    'pet_profile__user__last_name', 'pet_profile__user__username',
+)
+
 
-    for appointment in appointments:
-        # Calculate end time
-        end_time = appointment.appointment_time + appointment.service.duration
+def calendar_event_formatter(now):
+    """
+    Build a function turning a CALENDAR_EVENT_COLUMNS row into a JSON
+    FullCalendar event. Each user's display name is worked out once.
+    """
+    display_names = {}
 
-        # Check if appointment is in the past (send to frontend for color logic)
-        is_past = appointment.appointment_time < now
+    def display_name(user_id, first_name, last_name, username):
+        """Full name if available, otherwise username (cached per user)"""
+        if user_id not in display_names:
+            full_name = f"{first_name} {last_name}".strip()
+            display_names[user_id] = full_name or username
+        return display_names[user_id]
+
+    def format_event(row):
+        (appointment_id, start, end, status, pet_name, service_name,
+         employee_user_id, employee_first, employee_last, employee_username,
+         client_user_id, client_first, client_last, client_username) = row
 
         # Create employee name
-        if appointment.employee:
-            employee_name = (
-                appointment.employee.user.get_full_name()
-                if appointment.employee.user.get_full_name()
-                else appointment.employee.user.username
+        if employee_user_id:
+            employee_name = display_name(
+                employee_user_id, employee_first, employee_last,
+                employee_username
             )
+            title = f"{pet_name} - {service_name} ({employee_name})"
         else:
             employee_name = 'Unassigned'
+            title = f"{pet_name} - {service_name}"
 
-        title = f"{appointment.pet_profile.name} - {appointment.service.name}"
-        if appointment.employee:
-            title += f" ({employee_name})"
-
-        events.append({
-            'id': appointment.id,
+        return json.dumps({
+            'id': appointment_id,
             'title': title,
-            'start': appointment.appointment_time.isoformat(),
-            'end': end_time.isoformat(),
+            'start': start.isoformat(),
+            'end': end.isoformat(),
             # Colors will be applied by JavaScript for better performance
             'extendedProps': {
-                'status': appointment.status,
-                'pet_name': appointment.pet_profile.name,
-                'service': appointment.service.name,
+                'status': status,
+                'pet_name': pet_name,
+                'service': service_name,
                 'employee': employee_name,
-                'client': (appointment.pet_profile.user.get_full_name() or
-                           appointment.pet_profile.user.username),
-                'appointment_id': appointment.id,
-                'is_past': is_past
+                'client': display_name(
+                    client_user_id, client_first, client_last,
+                    client_username
+                ),
+                'appointment_id': appointment_id,
+                # Send to frontend for color logic
+                'is_past': start < now
             }
         })
 
-    print(f"DEBUG: Returning {len(events)} events")
+    return format_event
+
+
+def iter_calendar_events(appointments, now):
+    """
+    Yield a JSON array of FullCalendar events piece by piece.
+    Rows are fetched in chunks, so memory stays flat however many
+    appointments are in range.
+    """
+    format_event = calendar_event_formatter(now)
+    rows = appointments.values_list(*CALENDAR_EVENT_COLUMNS)
 
-    # Return just the events array (FullCalendar expects this format)
-    return JsonResponse(events, safe=False)
+    yield '['
+    count = 0
+    for row in rows.iterator(chunk_size=500):
+        yield (', ' if count else '') + format_event(row)
+        count += 1
+    yield ']'
+
+    logger.debug("Streamed %d calendar events", count)
 
 
 @require_GET
@@ -268,49 +381,39 @@ def approve_appointment_ajax(request):
                 'error': 'Missing appointment_id or employee_id'
             }, status=400)
 
-        appointment = get_object_or_404(Appointment, id=appointment_id)
-        employee = get_object_or_404(
-            UserProfile, id=employee_id, role='employee'
-        )
-
-        # Additional validation: appointment must still be pending
-        if appointment.status != 'pending':
-            return JsonResponse({
-                'success': False,
-                'error': 'Appointment is no longer pending approval'
-            }, status=400)
-
-        # Check if employee is available at this time
-        busy_calendar = EmployeeCalendar.objects.filter(
-            user_profile=employee,
-            scheduled_time=appointment.appointment_time
-        ).exists()
-
-        if busy_calendar:
-            return JsonResponse({
-                'success': False,
-                'error': 'Employee is not available at this time'
-            }, status=400)
-
-        # Verify appointment time is still in the future
-        if appointment.appointment_time <= timezone.now():
-            return JsonResponse({
-                'success': False,
-                'error': 'Cannot approve appointments in the past'
-            }, status=400)
-
-        # Update appointment
-        appointment.employee = employee
-        appointment.status = 'approved'
-        appointment.save()
+        with transaction.atomic():
+            # Lock both rows until the assignment is saved
+            appointment = get_object_or_404(
+                Appointment.objects.select_for_update(), id=appointment_id
+            )
+            employee = get_object_or_404(
+                UserProfile.objects.select_for_update(),
+                id=employee_id, role='employee'
+            )
 
-        # Create calendar entry
-        EmployeeCalendar.objects.create(
-            user_profile=employee,
-            appointment=appointment,
-            scheduled_time=appointment.appointment_time,
-            available_time=False
-        )
+            # Additional validation: appointment must still be pending
+            if appointment.status != 'pending':
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Appointment is no longer pending approval'
+                }, status=400)
+
+            # Verify appointment time is still in the future
+            if appointment.appointment_time <= timezone.now():
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Cannot approve appointments in the past'
+                }, status=400)
+
+            # Assign the employee unless they are busy at this time
+            appointment.status = 'approved'
+            try:
+                assign_employee(appointment, employee)
+            except EmployeeUnavailable:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Employee is not available at this time'
+                }, status=400)
 
         return JsonResponse({
             'success': True,
@@ -373,10 +476,7 @@ def get_available_employees(request):
     """Get available employees for a specific appointment time"""
     appointment_id = request.GET.get('appointment_id')
 
-    print(f"DEBUG: get_available_employees called with appointment_id: {appointment_id}")
-
     if not appointment_id:
-        print("DEBUG: No appointment_id provided")
         return JsonResponse({
             'success': False,
             'error': 'Missing appointment_id'
@@ -384,39 +484,38 @@ def get_available_employees(request):
 
     try:
         appointment = get_object_or_404(Appointment, id=appointment_id)
-        print(f"DEBUG: Found appointment {appointment.id} at {appointment.appointment_time}")
 
         # Get employees who are busy due to overlapping appointments
         from ..utils import get_overlapping_appointments
 
-        # Get overlapping approved appointments
-        overlapping_appointments = get_overlapping_appointments(appointment)
-        busy_employee_ids_appointments = [
-            appt.employee.id
-            for appt in overlapping_appointments
-            if appt.employee
-        ]
-
-        # Also check EmployeeCalendar for exact time conflicts (legacy support)
-        busy_employee_ids_calendar = EmployeeCalendar.objects.filter(
-            scheduled_time=appointment.appointment_time,
-            available_time=False
-        ).values_list('user_profile_id', flat=True)
-
-        # Combine both sources of busy employees
-        all_busy_employee_ids = list(busy_employee_ids_calendar) + busy_employee_ids_appointments
+        with span('busy_employees'):
+            # Get overlapping approved appointments
+            overlapping_appointments = get_overlapping_appointments(appointment)
+            busy_employee_ids_appointments = [
+                appt.employee_id
+                for appt in overlapping_appointments
+                if appt.employee_id
+            ]
+
+            # Also check EmployeeCalendar for exact time conflicts (legacy support)
+            busy_employee_ids_calendar = EmployeeCalendar.objects.filter(
+                scheduled_time=appointment.appointment_time,
+                available_time=False
+            ).values_list('user_profile_id', flat=True)
+
+            # Combine both sources of busy employees
+            all_busy_employee_ids = (
+                list(busy_employee_ids_calendar) + busy_employee_ids_appointments
+            )
 
-        print(f"DEBUG: Busy from calendar: {list(busy_employee_ids_calendar)}")
-        print(f"DEBUG: Busy from appointments: {list(busy_employee_ids_appointments)}")
-        print(f"DEBUG: All busy employee IDs: {all_busy_employee_ids}")
+        logger.debug("Busy employees for appointment %s: %s",
+                     appointment.id, all_busy_employee_ids)
 
         # Get available employees
         available_employees = UserProfile.objects.filter(
             role='employee'
         ).exclude(id__in=all_busy_employee_ids).select_related('user')
 
-        print(f"DEBUG: Found {available_employees.count()} available employees")
-
         employees_data = []
         for employee in available_employees:
             employee_info = {
@@ -425,10 +524,8 @@ def get_available_employees(request):
                          employee.user.username)
             }
             employees_data.append(employee_info)
-            print(f"DEBUG: Employee {employee_info['id']}: {employee_info['name']}")
 
         current_employee_id = appointment.employee.id if appointment.employee else None
-        print(f"DEBUG: Current employee ID: {current_employee_id}")
 
         response_data = {
             'success': True,
@@ -436,11 +533,11 @@ def get_available_employees(request):
             'current_employee': current_employee_id
         }
 
-        print(f"DEBUG: Returning response with {len(employees_data)} employees")
+        logger.debug("Returning %d available employees", len(employees_data))
         return JsonResponse(response_data)
 
     except Exception as e:
-        print(f"DEBUG: Exception in get_available_employees: {str(e)}")
+        logger.exception("Failed to get available employees")
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -456,79 +553,100 @@ def reassign_appointment_ajax(request):
         appointment_id = data.get('appointment_id')
         new_employee_id = data.get('employee_id')
 
-        print(f"DEBUG: Reassign request - appointment_id: {appointment_id}, "
-              f"employee_id: {new_employee_id}")
-
         if not appointment_id or not new_employee_id:
             return JsonResponse({
                 'success': False,
                 'error': 'Missing appointment_id or employee_id'
             }, status=400)
 
-        appointment = get_object_or_404(Appointment, id=appointment_id)
-        new_employee = get_object_or_404(
-            UserProfile, id=new_employee_id, role='employee'
-        )
-
-        current_emp_id = (appointment.employee.id
-                          if appointment.employee else None)
-        print(f"DEBUG: Current employee: {current_emp_id}")
-        print(f"DEBUG: New employee: {new_employee.id}")
-
-        # Check if it's the same employee (no change needed)
-        if (appointment.employee and
-                appointment.employee.id == int(new_employee_id)):
-            return JsonResponse({
-                'success': True,
-                'message': 'Appointment is already assigned to this employee'
-            })
+        with transaction.atomic():
+            # Lock both rows until the assignment is saved
+            appointment = get_object_or_404(
+                Appointment.objects.select_for_update(), id=appointment_id
+            )
+            new_employee = get_object_or_404(
+                UserProfile.objects.select_for_update(),
+                id=new_employee_id, role='employee'
+            )
 
-        # Check if new employee is available (but exclude current appointment)
-        busy_calendar = EmployeeCalendar.objects.filter(
-            user_profile=new_employee,
-            scheduled_time=appointment.appointment_time
-        ).exclude(appointment=appointment).exists()
+            # Check if it's the same employee (no change needed)
+            if appointment.employee_id == new_employee.id:
+                return JsonResponse({
+                    'success': True,
+                    'message': 'Appointment is already assigned to this employee'
+                })
+
+            # Move the appointment and its calendar entry unless the new
+            # employee is busy at this time
+            try:
+                assign_employee(appointment, new_employee)
+            except EmployeeUnavailable:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'New employee is not available at this time'
+                }, status=400)
+
+        employee_name = new_employee.user.username
+        logger.info("Appointment %s reassigned to employee %s",
+                    appointment.id, new_employee.id)
+
+        return JsonResponse({
+            'success': True,
+            'message': f'Appointment reassigned to {employee_name}'
+        })
 
-        if busy_calendar:
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }, status=400)
+    except Exception as e:
+        logger.exception("Failed to reassign appointment")
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@require_http_methods(["POST"])
+@user_passes_test(is_manager)
+def bulk_appointments_ajax(request):
+    """AJAX endpoint to approve, reject or reassign many appointments at once"""
+    try:
+        data = json.loads(request.body)
+        decisions = data.get('decisions') if isinstance(data, dict) else None
+
+        if not isinstance(decisions, list) or not decisions:
             return JsonResponse({
                 'success': False,
-                'error': 'New employee is not available at this time'
+                'error': 'Missing decisions'
             }, status=400)
 
-        # Remove old calendar entry if exists
-        if appointment.employee:
-            EmployeeCalendar.objects.filter(
-                appointment=appointment
-            ).delete()
-
-        # Update appointment
-        appointment.employee = new_employee
-        appointment.save()
-
-        # Create new calendar entry
-        EmployeeCalendar.objects.create(
-            user_profile=new_employee,
-            appointment=appointment,
-            scheduled_time=appointment.appointment_time,
-            available_time=False
-        )
+        if len(decisions) > MAX_BULK_DECISIONS:
+            return JsonResponse({
+                'success': False,
+                'error': f'At most {MAX_BULK_DECISIONS} decisions per request'
+            }, status=400)
 
-        employee_name = new_employee.user.username
-        print(f"DEBUG: Successfully reassigned to {employee_name}")
+        results = apply_decisions(decisions)
+        applied = sum(result['success'] for result in results)
+        logger.info("Bulk appointment decisions: %d applied, %d failed",
+                    applied, len(results) - applied)
 
         return JsonResponse({
             'success': True,
-            'message': f'Appointment reassigned to {employee_name}'
+            'applied': applied,
+            'failed': len(results) - applied,
+            'results': results
         })
 
     except json.JSONDecodeError:
-        print("DEBUG: JSON decode error")
         return JsonResponse({
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
-        print(f"DEBUG: Exception occurred: {str(e)}")
+        logger.exception("Failed to apply bulk appointment decisions")
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -0,0 +1,276 @@
+"""
+Dog Booking System
+Author: Kerem Haeger
+Created: August 2025
+"""
+import logging
+from functools import wraps
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import (
+    Http404, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+)
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from ..async_queries import run_queries
+from ..models import (
+    Service, PetProfile, ServicePrice, Appointment, UserProfile, EmployeeCalendar
+)
+from ..slot_cache import acached_available_slots
+from ..utils import get_overlapping_appointments
+from ..versioning import aslots_version, calendar_version, make_etag
+from .api_views import (
+    CALENDAR_EVENT_COLUMNS, calendar_appointments, calendar_event_formatter,
+    parse_calendar_datetime, parse_slot_request
+)
+from .roles import is_manager
+
+logger = logging.getLogger(__name__)
+
+# Async versions of the read-only AJAX endpoints in api_views, for ASGI
+# deployments. They return the same responses as the sync views. Django
+# 4.2's view decorators don't support coroutines, so the ones needed here
+# have async equivalents below.
+
+
+def require_get(view):
+    """@require_GET for async views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def private_no_cache(view):
+    """@cache_control(private=True, no_cache=True) for async views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        response = await view(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
+
+
+def manager_required(view):
+    """@user_passes_test(is_manager) for async views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not await sync_to_async(is_manager)(request.user):
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def conditional(request, etag, build_response):
+    """
+    Answer with 304 Not Modified if the client has the current version,
+    otherwise build the response (as @condition does for sync views).
+    """
+    etag = f'"{etag}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await build_response()
+    if request.method in ('GET', 'HEAD'):
+        response.headers.setdefault('ETag', etag)
+    return response
+
+
+@require_get
+@private_no_cache
+async def fetch_available_slots(request):
+    """AJAX endpoint to fetch available appointment slots for a service"""
+    if not all(request.GET.get(key) for key in ('service_id', 'start', 'end')):
+        return JsonResponse({'error': 'Missing parameters'}, status=400)
+
+    try:
+        service, start_date, end_date = await sync_to_async(
+            parse_slot_request
+        )(request)
+    except (Service.DoesNotExist, ValueError):
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+
+    current_time = timezone.now()
+    start_date = max(start_date, current_time.date())
+
+    # Same version components as available_slots_etag
+    if start_date > end_date:
+        version = {}
+        etag = make_etag('empty')
+    else:
+        minute = (current_time.replace(second=0, microsecond=0)
+                  if start_date == current_time.date() else None)
+        version = await aslots_version(service, start_date, end_date)
+        etag = make_etag(service.id, start_date, end_date, minute, version)
+
+    async def build_response():
+        slots = await acached_available_slots(service, version)
+        return JsonResponse([
+            {
+                "title": "Available",
+                "start": start_dt.isoformat(),
+                "end": end_dt.isoformat()
+            }
+            for _, start_dt, end_dt in slots
+            if start_dt > current_time
+        ], safe=False)
+
+    return await conditional(request, etag, build_response)
+
+
+@require_get
+async def get_service_price(request):
+    """AJAX endpoint to get service price for a specific pet size"""
+
+    pet_id = request.GET.get('pet_id')
+    service_id = request.GET.get('service_id')
+
+    if not pet_id or not service_id:
+        return JsonResponse({'error': 'Missing parameters'}, status=400)
+
+    try:
+        pet = await PetProfile.objects.aget(id=pet_id)
+        price = await ServicePrice.objects.aget(
+            service_id=service_id, size=pet.size
+        )
+        return JsonResponse({'price': f"{price.price:.2f}"})
+    except (PetProfile.DoesNotExist, ServicePrice.DoesNotExist):
+        return JsonResponse({'error': 'Unable to calculate price'},
+                            status=404)
+
+
+@require_get
+@private_no_cache
+async def get_calendar_events(request):
+    """AJAX endpoint to fetch calendar events for FullCalendar"""
+
+    start_str = request.GET.get('start')
+    end_str = request.GET.get('end')
+    employee_id = request.GET.get('employee_id')
+
+    if not start_str or not end_str:
+        return JsonResponse({'error': 'Missing start/end parameters'},
+                            status=400)
+
+    try:
+        start_date = parse_calendar_datetime(start_str)
+        end_date = parse_calendar_datetime(end_str)
+    except Exception as e:
+        logger.debug("Invalid calendar range %r - %r: %s",
+                     start_str, end_str, e)
+        return JsonResponse({
+            'error': f'Invalid date format: {str(e)}',
+            'start_received': start_str,
+            'end_received': end_str
+        }, status=400)
+
+    appointments = calendar_appointments(start_date, end_date, employee_id)
+
+    # Same version components as calendar_events_etag
+    now = timezone.now()
+    minute = (now.replace(second=0, microsecond=0)
+              if start_date <= now <= end_date else None)
+    etag = make_etag(
+        start_date, end_date, employee_id, minute,
+        await sync_to_async(calendar_version)(appointments)
+    )
+
+    async def build_response():
+        return StreamingHttpResponse(
+            aiter_calendar_events(appointments, now),
+            content_type='application/json'
+        )
+
+    return await conditional(request, etag, build_response)
+
+
+async def aiter_calendar_events(appointments, now):
+    """
+    Async version of iter_calendar_events. Django 4.2's aiterator() can't
+    stream values_list() querysets, so chunks of the sync iterator are
+    fetched on the request's thread instead.
+    """
+    format_event = calendar_event_formatter(now)
+    rows = appointments.values_list(*CALENDAR_EVENT_COLUMNS).iterator(
+        chunk_size=500
+    )
+    next_chunk = sync_to_async(lambda: list(islice(rows, 500)))
+
+    yield '['
+    count = 0
+    while chunk := await next_chunk():
+        for row in chunk:
+            yield (', ' if count else '') + format_event(row)
+            count += 1
+    yield ']'
+
+    logger.debug("Streamed %d calendar events", count)
+
+
+@require_get
+@manager_required
+async def get_available_employees(request):
+    """Get available employees for a specific appointment time"""
+    appointment_id = request.GET.get('appointment_id')
+
+    if not appointment_id:
+        return JsonResponse({
+            'success': False,
+            'error': 'Missing appointment_id'
+        }, status=400)
+
+    try:
+        try:
+            appointment = await Appointment.objects.select_related(
+                'service'
+            ).aget(id=appointment_id)
+        except Appointment.DoesNotExist:
+            raise Http404("No Appointment matches the given query.")
+
+        # Overlapping approved appointments and exact-time calendar
+        # entries (legacy support), fetched in one trip to the sync thread
+        busy_from_appointments, busy_from_calendar = await run_queries(
+            lambda: [
+                employee_id for employee_id in
+                get_overlapping_appointments(appointment).values_list(
+                    'employee_id', flat=True
+                )
+                if employee_id
+            ],
+            lambda: list(EmployeeCalendar.objects.filter(
+                scheduled_time=appointment.appointment_time,
+                available_time=False
+            ).values_list('user_profile_id', flat=True))
+        )
+        all_busy_employee_ids = busy_from_calendar + busy_from_appointments
+
+        logger.debug("Busy employees for appointment %s: %s",
+                     appointment.id, all_busy_employee_ids)
+
+        employees_data = [
+            {
+                'id': employee.id,
+                'name': (employee.user.get_full_name() or
+                         employee.user.username)
+            }
+            async for employee in UserProfile.objects.filter(
+                role='employee'
+            ).exclude(id__in=all_busy_employee_ids).select_related('user')
+        ]
+
+        logger.debug("Returning %d available employees", len(employees_data))
+        return JsonResponse({
+            'success': True,
+            'employees': employees_data,
+            'current_employee': appointment.employee_id
+        })
+
+    except Exception as e:
+        logger.exception("Failed to get available employees")
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
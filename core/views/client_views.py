@@ -5,14 +5,18 @@ Created: August 2025
 """
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import redirect, render, get_object_or_404
 from django.utils import timezone
 from datetime import datetime
+import logging
 from django_ratelimit.decorators import ratelimit
 
-from ..models import PetProfile, Appointment, ServicePrice
+from ..models import PetProfile, Appointment, ServicePrice, UserProfile
 from ..forms import PetProfileForm, AppointmentForm
 
+logger = logging.getLogger(__name__)
+
 
 @login_required
 def client_dashboard(request):
@@ -163,6 +167,7 @@ def delete_pet(request, pet_id):
 
 
 @ratelimit(key='user', rate='5/h', method='POST', block=True)
+@transaction.atomic
 def book_appointment(request):
     """Allow clients to book appointments for their approved pets"""
     user_profile = getattr(request.user, 'userprofile', None)
@@ -170,10 +175,12 @@ def book_appointment(request):
         return redirect('login')
 
     if request.method == 'POST':
-        print("Form submitted!")  # Debugging
+        # Lock the client's profile until the booking is saved, so that
+        # concurrent bookings are checked against the daily limit in turn
+        UserProfile.objects.select_for_update().get(id=user_profile.id)
+
         form = AppointmentForm(request.POST, user=request.user)
         if form.is_valid():
-            print("Form is valid!")  # Debug
             appointment = form.save(commit=False)
             service = appointment.service
             # ISO string, e.g. "2025-08-12T14:00:00Z"
@@ -225,7 +232,7 @@ def book_appointment(request):
             messages.success(request, success_msg)
             return redirect('client_dashboard')
         else:
-            print("Form errors:", form.errors)
+            logger.debug("Booking form errors: %s", form.errors.as_json())
     else:
         form = AppointmentForm(user=request.user)
 
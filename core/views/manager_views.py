@@ -6,37 +6,142 @@ Created: August 2025
 from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test, login_required
 from django.shortcuts import redirect, render, get_object_or_404
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, IntegerField, OuterRef, Prefetch, Q,
+    Subquery, Value, When, Window, prefetch_related_objects
+)
+from django.db.models.functions import Coalesce, ExtractYear, RowNumber
 from django.utils import timezone
 from datetime import date
+import logging
 from ..models import (
-    UserProfile, PetProfile, Appointment, EmployeeCalendar, Service, ServicePrice
+    UserProfile, PetProfile, Appointment, Service, ServicePrice
 )
 from ..forms import (
     PetApprovalForm, AppointmentApprovalForm, UserApprovalForm,
     ServiceForm, ServicePriceForm, PetProfileManagerForm
 )
+from ..assignments import OVERLAP_CONSTRAINT, EmployeeUnavailable, assign_employee
+from ..availability import find_busy_employees
+from ..counters import get_pending_counts
+from ..pagination import keyset_page, page_query
+from ..pet_approvals import apply_pet_decisions, submitted_pet_decisions
+from ..registrations import (
+    approve_pending_users, reject_pending_users, change_roles, submitted_roles
+)
 from .roles import is_manager
 
+logger = logging.getLogger(__name__)
+
+# Users shown per page of the user management listing
+USERS_PER_PAGE = 50
+
+# Pets shown per page of the verified pet directory, and the number of
+# recent appointments shown for each
+PETS_PER_PAGE = 50
+RECENT_APPOINTMENTS = 3
+
 
 @login_required
 def manager_dashboard(request):
     """Dashboard view for managers showing pending counts"""
-    pending_count = PetProfile.objects.filter(
-        profile_status='pending'
-    ).count()
-    pending_appt_count = Appointment.objects.filter(
-        status='pending'
-    ).count()
-    pending_user_count = UserProfile.objects.filter(
-        role='pending'
-    ).count()
+    counts = get_pending_counts()
     return render(request, 'core/dashboard/manager_dashboard.html', {
-        'pending_count': pending_count,
-        'pending_appt_count': pending_appt_count,
-        'pending_user_count': pending_user_count,
+        'pending_count': counts['pets'],
+        'pending_appt_count': counts['appointments'],
+        'pending_user_count': counts['users'],
     })
 
 
+def age_in_years(field, today):
+    """Whole years from a date field until today, calculated in SQL"""
+    birthday_to_come = (
+        Q(**{f'{field}__month__gt': today.month}) |
+        Q(**{f'{field}__month': today.month, f'{field}__day__gt': today.day})
+    )
+    return ExpressionWrapper(
+        today.year - ExtractYear(field) - Case(
+            When(birthday_to_come, then=Value(1)), default=Value(0)
+        ),
+        output_field=IntegerField()
+    )
+
+
+def pet_directory(request):
+    """
+    One page of the verified pet directory, filtered by name, size, breed
+    and owner (a search over names, or an exact owner_id). Age and
+    appointment count are calculated in SQL and only the three most recent
+    appointments of each pet on the page are loaded.
+    """
+    filters = {
+        key: request.GET.get(key, '').strip()
+        for key in ('q', 'size', 'breed', 'owner', 'owner_id')
+    }
+
+    pets = PetProfile.objects.filter(profile_status='verified')
+    if filters['q']:
+        pets = pets.filter(name__icontains=filters['q'])
+    if filters['size'] in dict(PetProfile.SIZE_CHOICES):
+        pets = pets.filter(size=filters['size'])
+    if filters['breed']:
+        pets = pets.filter(breed__icontains=filters['breed'])
+    if filters['owner_id'].isdigit():
+        pets = pets.filter(user_id=filters['owner_id'])
+    else:
+        filters['owner_id'] = ''
+    for term in filters['owner'].split():
+        pets = pets.filter(
+            Q(user__username__icontains=term) |
+            Q(user__first_name__icontains=term) |
+            Q(user__last_name__icontains=term)
+        )
+    total = pets.count()
+
+    appointment_count = Appointment.objects.filter(
+        pet_profile=OuterRef('pk')
+    ).order_by().values('pet_profile').annotate(count=Count('id')).values('count')
+
+    recent_appointments = Appointment.objects.annotate(
+        recency=Window(
+            RowNumber(),
+            partition_by=F('pet_profile'),
+            order_by=F('appointment_time').desc()
+        )
+    ).filter(recency__lte=RECENT_APPOINTMENTS).select_related('service').only(
+        'pet_profile', 'appointment_time', 'status', 'service__name'
+    ).order_by('-appointment_time')
+
+    # Names aren't unique, so the id breaks ties between page boundaries
+    page, next_after = keyset_page(
+        pets.select_related('user').annotate(
+            calculated_age=age_in_years('date_of_birth', date.today()),
+            appointment_count=Coalesce(Subquery(appointment_count), 0),
+        ),
+        ['name', 'id'], request.GET.getlist('after'), PETS_PER_PAGE
+    )
+    prefetch_related_objects(page, Prefetch(
+        'appointment_set', queryset=recent_appointments,
+        to_attr='recent_appointments'
+    ))
+
+    all_owners = request.GET.copy()
+    all_owners.pop('owner_id', None)
+
+    return {
+        'pets_page': page,
+        'pet_filters': filters,
+        'pet_total': total,
+        'all_owners_query': page_query(all_owners) if filters['owner_id'] else None,
+        'next_page_query': next_after and page_query(request.GET, next_after),
+        'first_page_query': (
+            page_query(request.GET) if 'after' in request.GET else None
+        ),
+        'show_all_pets': any(request.GET.get(key) for key in (*filters, 'after')),
+    }
+
+
 @user_passes_test(is_manager)
 def approve_pets(request):
     """Allow managers to approve or reject pending pet profiles and view all pets"""
@@ -45,44 +150,31 @@ def approve_pets(request):
             user_profile.role != 'manager'):
         return redirect('login')
 
-    pending_pets = PetProfile.objects.filter(profile_status='pending')
-
-    # Get all pets for the comprehensive view, with related data for efficiency
-    all_pets = PetProfile.objects.select_related('user').prefetch_related(
-        'appointment_set'
-    ).filter(profile_status='verified').order_by('-verified_at', 'name')
-
-    # Calculate age for each pet
-    for pet in all_pets:
-        if pet.date_of_birth:
-            today = date.today()
-            birth_date = pet.date_of_birth
-            age = today.year - birth_date.year - (
-                (today.month, today.day) < (birth_date.month, birth_date.day)
-            )
-            pet.calculated_age = age
-        else:
-            pet.calculated_age = None
-
     if request.method == 'POST':
-        for pet in pending_pets:
-            form = PetApprovalForm(request.POST, prefix=str(pet.id))
-            if form.is_valid():
-                decision = form.cleaned_data['decision']
-                size = form.cleaned_data['size']
-
-                if decision == 'approve':
-                    pet.profile_status = 'verified'
-                    pet.size = size
-                    pet.verified_at = timezone.now()
-                elif decision == 'reject':
-                    pet.profile_status = 'rejected'
-
-                pet.save()
+        # Only the submitted forms are validated, and the decisions are
+        # applied with one UPDATE per size plus one for rejections
+        decisions, invalid = submitted_pet_decisions(request.POST)
+        approved, rejected = apply_pet_decisions(decisions)
 
-        messages.success(request, "Pet profiles updated.")
+        if approved or rejected:
+            messages.success(
+                request,
+                f"Pet profiles updated: {approved} approved, {rejected} rejected."
+            )
+        elif not invalid:
+            messages.info(request, "No pet profiles were changed.")
+        if invalid:
+            messages.error(
+                request,
+                f"Not applied for {invalid} pet{'s' if invalid != 1 else ''}: "
+                "select a size before approving or rejecting."
+            )
         return redirect('approve_pets')
 
+    pending_pets = PetProfile.objects.filter(
+        profile_status='pending'
+    ).select_related('user')
+
     pet_forms = [
         (pet, PetApprovalForm(prefix=str(pet.id)))
         for pet in pending_pets
@@ -90,11 +182,31 @@ def approve_pets(request):
 
     context = {
         'pet_forms': pet_forms,
-        'all_pets': all_pets
+        'size_choices': PetProfile.SIZE_CHOICES,
+        **pet_directory(request),
     }
     return render(request, 'core/pets/approve_pets.html', context)
 
 
+def listing_columns(appointments):
+    """
+    Restrict an appointment queryset to the columns the dashboard displays,
+    joining the pet, owner and service so rows render without extra queries
+    """
+    return appointments.select_related(
+        'pet_profile__user', 'service'
+    ).only(
+        'appointment_time',
+        'status',
+        'pet_profile__name',
+        'pet_profile__user__username',
+        'pet_profile__user__first_name',
+        'pet_profile__user__last_name',
+        'service__name',
+        'service__duration',
+    )
+
+
 @user_passes_test(is_manager)
 def approve_appointments(request):
     """Allow managers to approve or reject pending appointments"""
@@ -123,25 +235,34 @@ def approve_appointments(request):
                     )
                     return redirect('approve_appointments')
 
-                selected_appointment.employee = selected_employee
-                selected_appointment.status = 'approved'
-                selected_appointment.save()
-
-                # Create EmployeeCalendar entry to mark employee as busy
-                # First check if entry already exists to prevent duplicates
-                existing_calendar = EmployeeCalendar.objects.filter(
-                    user_profile=selected_employee,
-                    scheduled_time=selected_appointment.appointment_time,
-                    available_time=False
-                ).first()
-
-                if not existing_calendar:
-                    EmployeeCalendar.objects.create(
-                        user_profile=selected_employee,
-                        appointment=selected_appointment,
-                        scheduled_time=selected_appointment.appointment_time,
-                        available_time=False
+                with transaction.atomic():
+                    # Lock both rows until the assignment is saved
+                    selected_appointment = get_object_or_404(
+                        Appointment.objects.select_for_update(),
+                        id=appointment_id
                     )
+                    selected_employee = get_object_or_404(
+                        UserProfile.objects.select_for_update(),
+                        id=selected_employee.id
+                    )
+
+                    # Another manager may have handled it in the meantime
+                    if selected_appointment.status != 'pending':
+                        messages.error(
+                            request, "Appointment is no longer pending approval."
+                        )
+                        return redirect('approve_appointments')
+
+                    selected_appointment.status = 'approved'
+                    try:
+                        assign_employee(selected_appointment, selected_employee)
+                    except EmployeeUnavailable:
+                        messages.error(
+                            request,
+                            f"{selected_employee.user.username} already has an "
+                            f"appointment at this time."
+                        )
+                        return redirect('approve_appointments')
 
                 success_msg = (f"Appointment approved and assigned to "
                                f"{selected_employee.user.username}. "
@@ -158,35 +279,30 @@ def approve_appointments(request):
 
         return redirect('approve_appointments')
 
+    # Get all employees once - used for every form and the filter dropdown
+    all_employees = list(UserProfile.objects.filter(
+        role='employee'
+    ).select_related('user'))
+
+    pending_appointments = list(
+        listing_columns(pending_appointments)
+    )
+
+    # Work out busy employees for every pending appointment in one pass
+    busy_employees = find_busy_employees(pending_appointments)
+
     # Build forms with unique prefixes - dynamically filter available employees
     appointment_forms = []
     for appointment in pending_appointments:
-        # Get all busy employees for appointments that overlap with this one
-        from ..utils import get_overlapping_appointments
-
-        # Get overlapping approved appointments
-        overlapping_appointments = get_overlapping_appointments(appointment)
-        busy_employee_ids_appointments = [
-            appt.employee.id
-            for appt in overlapping_appointments
-            if appt.employee
+        busy_ids = busy_employees[appointment.id]
+        available_employees = [
+            employee for employee in all_employees
+            if employee.id not in busy_ids
         ]
 
-        # Also check EmployeeCalendar for this exact time (legacy support)
-        busy_employee_ids_calendar = EmployeeCalendar.objects.filter(
-            scheduled_time=appointment.appointment_time,
-            available_time=False
-        ).values_list('user_profile_id', flat=True)
-
-        # Combine both sources to get all busy employees
-        all_busy_employee_ids = list(busy_employee_ids_calendar) + busy_employee_ids_appointments
-
-        available_employees = UserProfile.objects.filter(
-            role='employee'
-        ).exclude(id__in=all_busy_employee_ids)
-
-        form = AppointmentApprovalForm(prefix=str(appointment.id))
-        form.fields['employee'].queryset = available_employees
+        form = AppointmentApprovalForm(
+            prefix=str(appointment.id), employees=available_employees
+        )
 
         # Add helpful info about availability
         form.fields['employee'].help_text = (
@@ -196,19 +312,14 @@ def approve_appointments(request):
 
         appointment_forms.append((appointment, form))
 
-    approved_appointments = Appointment.objects.filter(
+    approved_appointments = listing_columns(Appointment.objects.filter(
         status='approved'
-    ).order_by('appointment_time')
+    ).order_by('appointment_time'))
 
     # Get rejected appointments for separate display
-    rejected_appointments = Appointment.objects.filter(
+    rejected_appointments = listing_columns(Appointment.objects.filter(
         status='rejected'
-    ).order_by('-appointment_time')  # Most recent first
-
-    # Get all employees for the filter dropdown
-    all_employees = UserProfile.objects.filter(
-        role='employee'
-    ).select_related('user')
+    ).order_by('-appointment_time'))  # Most recent first
 
     return render(request, 'core/appointments/appointments_dashboard.html', {
         'appointment_forms': appointment_forms,
@@ -218,6 +329,73 @@ def approve_appointments(request):
     })
 
 
+def log_progress(action):
+    """Progress callback logging how far a bulk user action has got"""
+    def progress(done, total):
+        logger.info("%s %d of %d pending users", action, done, total)
+    return progress
+
+
+def role_changes_summary(changes, shown=5):
+    """One message describing several role changes"""
+    details = ', '.join(
+        f'{username} from {old_role} to {new_role}'
+        for username, old_role, new_role in changes[:shown]
+    )
+    if len(changes) > shown:
+        details += f' and {len(changes) - shown} more'
+    return f'Updated {len(changes)} user roles: {details}.'
+
+
+def user_directory(request):
+    """
+    One page of the user listing (everyone except the current manager),
+    searched by name, username or email and filtered by role. Role counts
+    are grouped in the database and pets are counted, not loaded.
+    """
+    query = request.GET.get('q', '').strip()
+    role = request.GET.get('role', '')
+    if role not in dict(UserProfile.USER_ROLES):
+        role = ''
+
+    users = UserProfile.objects.exclude(user=request.user)
+    for term in query.split():
+        users = users.filter(
+            Q(user__username__icontains=term) |
+            Q(user__first_name__icontains=term) |
+            Q(user__last_name__icontains=term) |
+            Q(user__email__icontains=term)
+        )
+
+    counts = dict(users.values_list('role').annotate(count=Count('id')).order_by())
+    role_counts = [
+        (value, label, counts.get(value, 0))
+        for value, label in UserProfile.USER_ROLES
+    ]
+
+    if role:
+        users = users.filter(role=role)
+
+    # Usernames are unique, so they alone identify a page boundary
+    page, next_after = keyset_page(
+        users.select_related('user').annotate(pet_count=Count('user__pets')),
+        ['user__username'], request.GET.getlist('after'), USERS_PER_PAGE
+    )
+
+    return {
+        'users_page': page,
+        'user_query': query,
+        'user_role': role,
+        'role_counts': role_counts,
+        'user_total': sum(counts.values()),
+        'next_page_query': next_after and page_query(request.GET, next_after),
+        'first_page_query': (
+            page_query(request.GET) if 'after' in request.GET else None
+        ),
+        'show_all_users': any(key in request.GET for key in ('q', 'role', 'after')),
+    }
+
+
 @user_passes_test(is_manager)
 def approve_users(request):
     """Allow managers to approve or reject pending users and manage all users"""
@@ -226,57 +404,43 @@ def approve_users(request):
         role='pending'
     ).select_related('user').order_by('created_at')
 
-    # Get all users except the current manager for comprehensive management
-    all_users = UserProfile.objects.exclude(
-        user=request.user
-    ).select_related('user').prefetch_related(
-        'user__pets'
-    ).order_by('role', 'user__username')
-
     if request.method == 'POST':
         # Check if it's a role update (comprehensive management)
         if 'role_update' in request.POST:
-            # Handle role updates for all users
-            for user_profile in all_users:
-                role_field = f'role_{user_profile.id}'
-                if role_field in request.POST:
-                    new_role = request.POST.get(role_field)
-                    valid_roles = [
-                        choice[0] for choice in UserProfile.USER_ROLES
-                    ]
-
-                    if (new_role in valid_roles and
-                            new_role != user_profile.role):
-                        old_role = user_profile.role
-                        user_profile.role = new_role
-                        user_profile.save()
-
-                        messages.success(
-                            request,
-                            f'Updated {user_profile.user.username} role '
-                            f'from {old_role} to {new_role}.'
-                        )
+            # Only the submitted role fields are looked at, and only the
+            # profiles whose role changes are loaded and saved
+            changes = change_roles(
+                submitted_roles(request.POST), exclude_user=request.user
+            )
 
-            return redirect('approve_users')
+            if len(changes) == 1:
+                username, old_role, new_role = changes[0]
+                messages.success(
+                    request,
+                    f'Updated {username} role from {old_role} to {new_role}.'
+                )
+            elif changes:
+                messages.success(request, role_changes_summary(changes))
+            else:
+                messages.info(request, 'No roles were changed.')
+
+            # Back to the same page of the user listing
+            return redirect(request.get_full_path())
 
         # Handle bulk actions for pending users
         elif 'bulk_approve_clients' in request.POST:
-            for user_profile in pending_users:
-                user_profile.role = 'client'
-                user_profile.save()
+            count = approve_pending_users(
+                'client', progress=log_progress('Approved')
+            )
 
             messages.success(
                 request,
-                f'Successfully approved {pending_users.count()} users.'
+                f'Successfully approved {count} users.'
             )
             return redirect('approve_users')
 
         elif 'bulk_reject' in request.POST:
-            count = pending_users.count()
-
-            # Delete all pending users
-            for user_profile in pending_users:
-                user_profile.user.delete()
+            count = reject_pending_users(progress=log_progress('Rejected'))
 
             messages.info(
                 request,
@@ -323,19 +487,10 @@ def approve_users(request):
         form = UserApprovalForm(prefix=str(user_profile.id))
         user_forms.append((user_profile, form))
 
-    # Group all users by role for better organization
-    users_by_role = {}
-    for user_profile in all_users:
-        role = user_profile.role
-        if role not in users_by_role:
-            users_by_role[role] = []
-        users_by_role[role].append(user_profile)
-
     context = {
         'user_forms': user_forms,
-        'all_users': all_users,
-        'users_by_role': users_by_role,
         'role_choices': UserProfile.USER_ROLES,
+        **user_directory(request),
     }
 
     return render(request, 'core/users/approve_users.html', context)
@@ -380,13 +535,18 @@ def edit_service(request, service_id):
     if request.method == 'POST':
         form = ServiceForm(request.POST, instance=service)
         if form.is_valid():
-            service = form.save()
-
-            messages.success(
-                request,
-                f'Service "{service.name}" updated successfully!'
-            )
-            return redirect('manage_services')
+            try:
+                service = form.save()
+            except IntegrityError as error:
+                if OVERLAP_CONSTRAINT not in str(error):
+                    raise
+                form.add_overlap_error()
+            else:
+                messages.success(
+                    request,
+                    f'Service "{service.name}" updated successfully!'
+                )
+                return redirect('manage_services')
     else:
         form = ServiceForm(instance=service)
 